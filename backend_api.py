@@ -1,7 +1,9 @@
 import asyncio
+import json
 import os
 import sqlite3
 import shutil
+import time
 import psutil  
 import requests  
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect  
@@ -9,7 +11,7 @@ from fastapi import HTTPException
 from fastapi.middleware.cors import CORSMiddleware  
 from fastapi.responses import FileResponse  
 from pydantic import BaseModel  
-from typing import Optional, Dict, List, Any, cast
+from typing import Optional, Dict, List, Any, Tuple, cast
 from core.voice_assistant import voice_assistant  
 from core.function_executor import executor as function_executor  
 from core.productivity_suite import productivity_suite
@@ -21,6 +23,11 @@ from core.settings_store import settings as settings_store
 from core.privacy_tracker import privacy_tracker  
 from config import VOICE_ASSISTANT_ENABLED, OLLAMA_URL, LOCAL_ROUTER_PATH, CUSTOM_PPN_PATH  
 
+try:
+    import orjson  # Optional: much faster serialization for the polled WebSocket feeds
+except ImportError:
+    orjson = None
+
 app = FastAPI(title="Wolf AI Backend API")
 
 # Setup CORS to allow the frontend to connect
@@ -42,13 +49,48 @@ async def get_system_status():
     """Get system status for startup script."""
     return system_status
 
+def _ws_dumps(payload: Any) -> str:
+    """Serialize a WebSocket payload the way send_json does (compact, non-ASCII kept)."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+
+async def _send_if_changed(websocket: WebSocket, payload: Any, last_frame: str) -> str:
+    """
+    Send payload only if it differs from the previous frame; returns the new frame text.
+
+    Serializing once serves as both the change check and the frame itself, so
+    polled feeds stop sending identical frames and stop encoding state twice a tick.
+    """
+    frame = _ws_dumps(payload)
+    if frame != last_frame:
+        await websocket.send_text(frame)
+    return frame
+
+
+FRONTEND_INDEX_FILE = os.path.join(os.path.dirname(__file__), "frontend", "dist", "index.html")
+
+# path -> (checked_at, exists); short TTL so a fresh frontend build is still picked up
+_path_exists_cache: Dict[str, Tuple[float, bool]] = {}
+
+
+def _cached_exists(path: str, ttl: float = 30.0) -> bool:
+    """os.path.exists with a small TTL cache for paths probed on every request."""
+    now = time.monotonic()
+    cached = _path_exists_cache.get(path)
+    if cached and now - cached[0] < ttl:
+        return cached[1]
+    exists = os.path.exists(path)
+    _path_exists_cache[path] = (now, exists)
+    return exists
+
 @app.get("/")
 async def serve_frontend():
     """Serve the frontend index.html."""
-    frontend_dist = os.path.join(os.path.dirname(__file__), "frontend", "dist")
-    index_file = os.path.join(frontend_dist, "index.html")
+    index_file = FRONTEND_INDEX_FILE
     
-    if os.path.exists(index_file):
+    if _cached_exists(index_file):
         return FileResponse(index_file)
     else:
         return {"message": "Frontend not built. Run 'cd frontend && npm run build'"}
@@ -326,47 +368,61 @@ except Exception as e:
 last_net_io = psutil.net_io_counters()
 last_net_time = asyncio.get_event_loop().time() if asyncio.get_event_loop().is_running() else 0
 
+# One stats sample per interval, shared by every connected monitor. psutil's non-blocking
+# cpu_percent() measures since its previous call, so per-client sampling would shrink each
+# client's window (and the shared network baseline) to near zero.
+SYSTEM_SNAPSHOT_TTL = 1.0
+_system_snapshot: Dict[str, Any] = {}
+_system_snapshot_time = 0.0
+
+def _get_system_snapshot() -> Dict[str, Any]:
+    global last_net_io, last_net_time, _system_snapshot, _system_snapshot_time
+    current_time = asyncio.get_event_loop().time()
+    if _system_snapshot and current_time - _system_snapshot_time < SYSTEM_SNAPSHOT_TTL:
+        return _system_snapshot
+    
+    if not last_net_time:
+        last_net_time = current_time
+    
+    # CPU & RAM
+    cpu_percent = psutil.cpu_percent(interval=0)
+    ram = psutil.virtual_memory()
+    ram_percent = ram.percent
+    
+    # Network Calculation (Mbps)
+    current_net_io = psutil.net_io_counters()
+    time_delta = current_time - last_net_time
+    
+    if time_delta > 0:
+        bytes_sent = current_net_io.bytes_sent - last_net_io.bytes_sent
+        bytes_recv = current_net_io.bytes_recv - last_net_io.bytes_recv
+        
+        # Convert bytes/sec to Mbps
+        net_up = (bytes_sent * 8) / (1024 * 1024) / time_delta
+        net_down = (bytes_recv * 8) / (1024 * 1024) / time_delta
+    else:
+        net_up = 0.0
+        net_down = 0.0
+        
+    last_net_io = current_net_io
+    last_net_time = current_time
+    
+    _system_snapshot = {
+        "cpu": int(cpu_percent),
+        "ram": int(ram_percent),
+        "netUp": float(f"{net_up:.1f}"),
+        "netDown": float(f"{net_down:.1f}")
+    }
+    _system_snapshot_time = current_time
+    return _system_snapshot
+
 @app.websocket("/ws/system")
 async def websocket_system_monitor(websocket: WebSocket):
-    global last_net_io, last_net_time
     await websocket.accept()
-    
-    if not last_net_time:
-        last_net_time = asyncio.get_event_loop().time()
         
     try:
         while True:
-            # CPU & RAM
-            cpu_percent = psutil.cpu_percent(interval=0)
-            ram = psutil.virtual_memory()
-            ram_percent = ram.percent
-            
-            # Network Calculation (Mbps)
-            current_net_io = psutil.net_io_counters()
-            current_time = asyncio.get_event_loop().time()
-            time_delta = current_time - last_net_time
-            
-            if time_delta > 0:
-                bytes_sent = current_net_io.bytes_sent - last_net_io.bytes_sent
-                bytes_recv = current_net_io.bytes_recv - last_net_io.bytes_recv
-                
-                # Convert bytes/sec to Mbps
-                net_up = (bytes_sent * 8) / (1024 * 1024) / time_delta
-                net_down = (bytes_recv * 8) / (1024 * 1024) / time_delta
-            else:
-                net_up = 0.0
-                net_down = 0.0
-                
-            last_net_io = current_net_io
-            last_net_time = current_time
-
-            data = {
-                "cpu": int(cpu_percent),
-                "ram": int(ram_percent),
-                "netUp": float(f"{net_up:.1f}"),
-                "netDown": float(f"{net_down:.1f}")
-            }
-            await websocket.send_json(data)
+            await websocket.send_json(_get_system_snapshot())
             await asyncio.sleep(1)
     except WebSocketDisconnect:
         pass
@@ -390,21 +446,27 @@ async def websocket_privacy_monitor(websocket: WebSocket):
 class SafetyConnectionManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        # Snapshot broadcast iterates; rebuilt only when connections change
+        self._targets: Tuple[WebSocket, ...] = ()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
         self.active_connections.append(websocket)
+        self._targets = tuple(self.active_connections)
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+            self._targets = tuple(self.active_connections)
 
     async def broadcast(self, message: dict):
-        for connection in self.active_connections:
+        frame = _ws_dumps(message)
+        for connection in self._targets:
             try:
-                await connection.send_json(message)
+                await connection.send_text(frame)
             except Exception:
-                pass
+                # Dead socket: drop it so later broadcasts skip it
+                self.disconnect(connection)
 
 safety_manager = SafetyConnectionManager()
 pending_confirmations: Dict[str, asyncio.Event] = {}
@@ -464,21 +526,27 @@ async def websocket_safety_sandbox(websocket: WebSocket):
 class ClarificationConnectionManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        # Snapshot broadcast iterates; rebuilt only when connections change
+        self._targets: Tuple[WebSocket, ...] = ()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
         self.active_connections.append(websocket)
+        self._targets = tuple(self.active_connections)
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+            self._targets = tuple(self.active_connections)
 
     async def broadcast(self, message: dict):
-        for connection in self.active_connections:
+        frame = _ws_dumps(message)
+        for connection in self._targets:
             try:
-                await connection.send_json(message)
+                await connection.send_text(frame)
             except Exception:
-                pass
+                # Dead socket: drop it so later broadcasts skip it
+                self.disconnect(connection)
 
 clarification_manager = ClarificationConnectionManager()
 pending_clarifications: Dict[str, asyncio.Event] = {}
@@ -540,6 +608,7 @@ async def get_privacy_logs():
 async def websocket_system_status(websocket: WebSocket):
     await websocket.accept()
     try:
+        last_frame = ""
         while True:
             # Sync the Voice Core status based on the boolean
             if VOICE_ASSISTANT_ENABLED:
@@ -548,8 +617,8 @@ async def websocket_system_status(websocket: WebSocket):
             # Neural Sonic status is already set by TTS in system_status
             # Don't override it with media state which is for music playback
                 
-            await websocket.send_json(system_status)
-            await asyncio.sleep(0.5) # Send updates twice a second
+            last_frame = await _send_if_changed(websocket, system_status, last_frame)
+            await asyncio.sleep(0.5) # Check for updates twice a second
     except WebSocketDisconnect:
         pass
 
@@ -558,13 +627,9 @@ async def websocket_system_status(websocket: WebSocket):
 async def websocket_diagnostics(websocket: WebSocket):
     await websocket.accept()
     try:
-        last_hash = ""
+        last_frame = ""
         while True:
-            payload = get_diagnostics_payload()
-            payload_hash = str(payload)
-            if payload_hash != last_hash:
-                await websocket.send_json(payload)
-                last_hash = payload_hash
+            last_frame = await _send_if_changed(websocket, get_diagnostics_payload(), last_frame)
             await asyncio.sleep(0.5)
     except WebSocketDisconnect:
         pass
@@ -690,14 +755,11 @@ async def websocket_chat(websocket: WebSocket):
         return cleaned
 
     try:
-        last_hash = ""
+        last_frame = ""
         while True:
             if VOICE_ASSISTANT_ENABLED:
-                messages = get_clean_messages()
-                messages_hash = str(messages)
-                if messages_hash != last_hash:
-                    await websocket.send_json({"messages": messages})
-                    last_hash = messages_hash
+                # Streaming tokens are coalesced into at most one frame per 100 ms tick
+                last_frame = await _send_if_changed(websocket, {"messages": get_clean_messages()}, last_frame)
             await asyncio.sleep(0.1)
     except WebSocketDisconnect:
         pass
@@ -33,6 +33,8 @@ WAKE_WORD_CONFIRMATION_COUNT = 1  # Require multiple detections before triggerin
 STT_SAMPLE_RATE = 16000
 STT_CHUNK_SIZE = 4096
 STT_RECORD_TIMEOUT = 5.0  # Maximum seconds to record after wake word
+STT_STREAM_PARTIALS = True  # Emit partial hypotheses while the user is still speaking
+STT_EARLY_TRANSCRIPTION_MS = 200  # Start the final pass this far into the end-of-speech silence
 
 # --- Voice Assistant Configuration ---
 VOICE_ASSISTANT_ENABLED = True
@@ -6,6 +6,7 @@ Enables to voice assistant to understand and execute complex, multi-step tasks l
 import re
 import os
 import json
+import shutil
 import subprocess
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
@@ -13,16 +14,94 @@ from PIL import Image
 import pyautogui
 import time
 from pathlib import Path
+from functools import lru_cache
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "resources" / "templates"
+
+
+@lru_cache(maxsize=None)
+def _load_template(name: str) -> str:
+    """Read a scaffold template from resources/templates on first use."""
+    return (TEMPLATES_DIR / name).read_text(encoding="utf-8").rstrip("\n")
+
+
+# Spoken app names -> launcher command, resolved with a single dict lookup
+_APP_EXECUTABLES = {
+    "vscode": "code",
+    "visual studio code": "code",
+    "code": "code",
+    "chrome": "chrome",
+    "firefox": "firefox"
+}
+
+# Launchers started from here outlive the command; DETACHED_PROCESS only exists on Windows
+_DETACHED_CREATIONFLAGS = subprocess.DETACHED_PROCESS if os.name == 'nt' else 0
+
+# Processes closed when resetting to a clean state (substring match on the process name)
+_CLEANUP_PROCESS_RE = re.compile(r"code|chrome|firefox|notepad|explorer")
+
+# "create/build/make a website|web site|web app" as a single scan instead of three near-duplicates
+_CREATE_WEB_RE = re.compile(r"(?:build|create|make)\s+(?:a\s+)?(?:website|web\s+site|web\s+app)")
+
+# Task intent patterns, each intent's alternatives compiled into one regex. Dict order matters:
+# the last intent that matches wins.
+_TASK_INTENTS = {
+    "create_file": {
+        "pattern": re.compile(r"(?:create|make|write|build)\s+(?:a\s+)?(?:text\s+)?file"),
+        "complexity": "medium",
+        "actions": ["file_operations", "text_generation"]
+    },
+    "create_folder": {
+        "pattern": re.compile(r"(?:create|make)\s+(?:a\s+)?(?:folder|directory)|new\s+(?:folder|directory)"),
+        "complexity": "low",
+        "actions": ["file_operations"]
+    },
+    "open_ide": {
+        "pattern": re.compile(r"(?:open|launch|start)\s+(?:visual\s+studio\s+code|vs\s+code|code\s+editor)"),
+        "complexity": "low",
+        "actions": ["application_launch"]
+    },
+    "web_development": {
+        "pattern": re.compile("|".join((_CREATE_WEB_RE.pattern, r"portfolio\s+website", r"web\s+development", r"html\s+css\s+javascript"))),
+        "complexity": "high",
+        "actions": ["file_operations", "application_launch", "text_generation"]
+    },
+    "multi_step_task": {
+        "pattern": re.compile(r"build.*then.*open|create.*then.*launch|setup.*and.*open|create.*and.*start|build.*and.*open"),
+        "complexity": "high",
+        "actions": ["file_operations", "application_launch", "text_generation"]
+    },
+    "project_setup": {
+        "pattern": re.compile(r"setup\s+(?:a\s+)?(?:project|development)|create\s+(?:a\s+)?(?:project|folder\s+structure)|initialize\s+(?:a\s+)?(?:project|repo)"),
+        "complexity": "high",
+        "actions": ["file_operations", "application_launch"]
+    },
+    "navigate_desktop": {
+        "pattern": re.compile(r"(?:go|navigate)\s+to\s+desktop|show\s+desktop"),
+        "complexity": "low",
+        "actions": ["navigation"]
+    },
+    "complex_workflow": {
+        "pattern": re.compile(r"setup\s+(?:development\s+)?environment|prepare\s+(?:my\s+)?workspace|organize\s+(?:my\s+)?project"),
+        "complexity": "high",
+        "actions": ["multi_step"]
+    }
+}
 
 class AdvancedTaskExecutor:
     """Handles complex task understanding and execution with AI reasoning."""
     
+    # Absolute path of the VS Code CLI, shared by all instances once resolved
+    _code_cli_path: Optional[str] = None
+    
     def __init__(self):
         self.task_history = []
         self.current_context = {}
         self.user_preferences = {}
         self.screenshot_dir = os.path.join(os.path.expanduser("~"), "Desktop", "ai_screenshots")
         os.makedirs(self.screenshot_dir, exist_ok=True)
+        # Working directory as last set by this executor (os.chdir in _create_folder)
+        self._cwd = os.getcwd()
         # Learning Loop State
         self.last_failed_query = None
         self.recorded_steps_since_failure = []
@@ -79,62 +158,15 @@ class AdvancedTaskExecutor:
         """Analyze user intent and task complexity."""
         user_lower = user_input.lower()
         
-        # Task intent patterns
-        intents = {
-            "create_file": {
-                "patterns": [r"create\s+(?:a\s+)?(?:text\s+)?file", r"make\s+(?:a\s+)?(?:text\s+)?file", r"write\s+(?:a\s+)?(?:text\s+)?file", r"build\s+(?:a\s+)?(?:text\s+)?file"],
-                "complexity": "medium",
-                "actions": ["file_operations", "text_generation"]
-            },
-            "create_folder": {
-                "patterns": [r"create\s+(?:a\s+)?(?:folder|directory)", r"make\s+(?:a\s+)?(?:folder|directory)", r"new\s+(?:folder|directory)"],
-                "complexity": "low",
-                "actions": ["file_operations"]
-            },
-            "open_ide": {
-                "patterns": [r"open\s+(?:visual\s+studio\s+code|vs\s+code|code\s+editor)", r"launch\s+(?:visual\s+studio\s+code|vs\s+code|code\s+editor)", r"start\s+(?:visual\s+studio\s+code|vs\s+code|code\s+editor)"],
-                "complexity": "low",
-                "actions": ["application_launch"]
-            },
-            "web_development": {
-                "patterns": [r"build\s+(?:a\s+)?(?:website|web\s+site|web\s+app)", r"create\s+(?:a\s+)?(?:website|web\s+site|web\s+app)", r"make\s+(?:a\s+)?(?:website|web\s+site|web\s+app)", r"portfolio\s+website", r"web\s+development", r"html\s+css\s+javascript"],
-                "complexity": "high",
-                "actions": ["file_operations", "application_launch", "text_generation"]
-            },
-            "multi_step_task": {
-                "patterns": [r"build.*then.*open", r"create.*then.*launch", r"setup.*and.*open", r"create.*and.*start", r"build.*and.*open"],
-                "complexity": "high",
-                "actions": ["file_operations", "application_launch", "text_generation"]
-            },
-            "project_setup": {
-                "patterns": [r"setup\s+(?:a\s+)?(?:project|development)", r"create\s+(?:a\s+)?(?:project|folder\s+structure)", r"initialize\s+(?:a\s+)?(?:project|repo)"],
-                "complexity": "high",
-                "actions": ["file_operations", "application_launch"]
-            },
-            "navigate_desktop": {
-                "patterns": [r"go\s+to\s+desktop", r"navigate\s+to\s+desktop", r"show\s+desktop"],
-                "complexity": "low",
-                "actions": ["navigation"]
-            },
-            "complex_workflow": {
-                "patterns": [r"setup\s+(?:development\s+)?environment", r"prepare\s+(?:my\s+)?workspace", r"organize\s+(?:my\s+)?project"],
-                "complexity": "high",
-                "actions": ["multi_step"]
-            }
-        }
-        
         # Match intent
         matched_intent = None
         confidence = 0.0
         
-        for intent_name, intent_data in intents.items():
-            for pattern in intent_data["patterns"]:
-                if re.search(pattern, user_lower):
-                    matched_intent = intent_name
-                    confidence = 0.8 + (0.1 * len(pattern.split()))  # Longer patterns = higher confidence
-                    if confidence > confidence:
-                        confidence = confidence
-                        matched_intent = intent_name
+        for intent_name, intent_data in _TASK_INTENTS.items():
+            pattern = intent_data["pattern"]
+            if pattern.search(user_lower):
+                matched_intent = intent_name
+                confidence = 0.8 + (0.1 * len(pattern.pattern.split()))  # Longer patterns = higher confidence
         
         if not matched_intent:
             return {"intent": "unknown", "confidence": 0.1, "complexity": "unknown"}
@@ -142,8 +174,8 @@ class AdvancedTaskExecutor:
         return {
             "intent": matched_intent,
             "confidence": confidence,
-            "complexity": intents[matched_intent]["complexity"],
-            "actions": intents[matched_intent]["actions"]
+            "complexity": _TASK_INTENTS[matched_intent]["complexity"],
+            "actions": _TASK_INTENTS[matched_intent]["actions"]
         }
     
     def _extract_entities(self, user_input: str) -> Dict[str, Any]:
@@ -272,96 +304,6 @@ class AdvancedTaskExecutor:
         
         return plan
     
-    def _generate_html_content(self, entities: Dict) -> str:
-        """Generate HTML content based on context."""
-        file_name = entities.get("file_name", "index.html")
-        
-        if "website" in file_name.lower() or "index" in file_name.lower():
-            return """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>My Demo Website</title>
-    <style>
-        body {
-            font-family: Arial, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            min-height: 100vh;
-        }
-        .container {
-            max-width: 800px;
-            margin: 0 auto;
-            background: rgba(255, 255, 255, 0.1);
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        }
-        h1 {
-            color: #4CAF50;
-            text-align: center;
-            margin-bottom: 30px;
-        }
-        .feature {
-            background: rgba(76, 175, 80, 0.2);
-            padding: 20px;
-            margin: 20px 0;
-            border-radius: 5px;
-            border-left: 4px solid #4CAF50;
-        }
-        .btn {
-            background: #4CAF50;
-            color: white;
-            padding: 12px 24px;
-            border: none;
-            border-radius: 5px;
-            cursor: pointer;
-            font-size: 16px;
-            margin: 10px 5px;
-        }
-        .btn:hover {
-            background: #45a049;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🚀 Welcome to My Demo Website</h1>
-        
-        <div class="feature">
-            <h2>✨ Features</h2>
-            <p>This is a demo website created by Wolf AI Assistant with advanced task understanding capabilities.</p>
-            <ul>
-                <li>🤖 AI-powered task comprehension</li>
-                <li>📋 Multi-step execution planning</li>
-                <li>🎯 Intelligent file operations</li>
-                <li>🔧 Development environment setup</li>
-            </ul>
-        </div>
-        
-        <div class="feature">
-            <h2>🎯 Capabilities</h2>
-            <p>The assistant can understand complex commands and break them down into executable steps.</p>
-            <button class="btn" onclick="alert('Hello from AI!')">Click Me!</button>
-        </div>
-        
-        <div class="feature">
-            <h2>📱 Created by</h2>
-            <p>Generated using advanced AI task execution with human-like understanding.</p>
-        </div>
-    </div>
-    
-    <script>
-        console.log('Website loaded successfully!');
-    </script>
-</body>
-</html>"""
-        
-        return "<html><body><h1>Hello World</h1></body></html>"
-    
     def execute_plan(self, plan: List[Dict[str, Any]], original_query: Optional[str] = None) -> Dict[str, Any]:
         """Execute plan with visual verification and autonomous learning loop."""
         print(f"[AdvancedTask] ⚡ Executing plan with {len(plan)} steps (Visual AI Mode)")
@@ -519,12 +461,10 @@ class AdvancedTaskExecutor:
             else:
                 full_path = path
             
-            # Use PowerShell to navigate
-            command = f'cd "{full_path}"'
-            result = subprocess.run(["powershell", "-Command", command], capture_output=True, text=True)
-            
+            # A child shell's `cd` can't move this process anyway; all it reported was whether
+            # the folder exists, which is checked in-process without spawning PowerShell
             return {
-                "success": result.returncode == 0,
+                "success": os.path.isdir(full_path),
                 "message": f"Navigated to {full_path}",
                 "path": full_path
             }
@@ -535,15 +475,14 @@ class AdvancedTaskExecutor:
         """Create a file with specified content."""
         try:
             # Use current working directory (should be the project folder after navigation)
-            current_path = os.getcwd()
+            current_path = self._cwd
             file_path = os.path.join(current_path, filename)
             
             # Use provided content or default
             file_content = content if content else f"Created file: {filename}"
             
             # Write file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(file_content)
+            Path(file_path).write_text(file_content, encoding='utf-8')
             
             return {
                 "success": True,
@@ -564,12 +503,13 @@ class AdvancedTaskExecutor:
             
             # Change to the newly created folder
             os.chdir(folder_path)
+            self._cwd = os.getcwd()
             
             return {
                 "success": True,
                 "message": f"Created and navigated to folder {folder_name}",
                 "folder_path": folder_path,
-                "current_dir": os.getcwd()
+                "current_dir": self._cwd
             }
         except Exception as e:
             return {"success": False, "message": f"Folder creation failed: {e}"}
@@ -577,36 +517,32 @@ class AdvancedTaskExecutor:
     def _launch_application(self, app_name: str) -> Dict[str, Any]:
         """Launch application with intelligent detection."""
         try:
-            # Map common app names to executable names
-            app_mapping = {
-                "vscode": "code",
-                "visual studio code": "code",
-                "code": "code",
-                "chrome": "chrome",
-                "firefox": "firefox"
-            }
-            
             normalized_app = app_name.lower()
-            executable = app_mapping.get(normalized_app, app_name)
+            executable = _APP_EXECUTABLES.get(normalized_app, app_name)
             
             # For VS Code, open the current folder as a project
             if executable == "code":
-                current_path = os.getcwd()
+                current_path = self._cwd
                 # Try multiple methods to open VS Code
-                import subprocess
                 
-                # Method 1: Try direct 'code' command
-                try:
-                    result = subprocess.run([executable, current_path], capture_output=True, timeout=10)
-                    if result.returncode == 0:
+                # Method 1: Launch the 'code' CLI directly without waiting on its handshake
+                code_path = self._find_code_cli()
+                if code_path:
+                    try:
+                        subprocess.Popen(
+                            [code_path, current_path],
+                            stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL,
+                            start_new_session=True
+                        )
                         return {
                             "success": True,
                             "message": f"Launched {app_name} with project folder",
                             "app": executable,
                             "folder": current_path
                         }
-                except (subprocess.TimeoutExpired, FileNotFoundError):
-                    pass
+                    except OSError:
+                        AdvancedTaskExecutor._code_cli_path = None
                 
                 # Method 2: Try using PC controller as fallback
                 try:
@@ -640,22 +576,41 @@ class AdvancedTaskExecutor:
         except Exception as e:
             return {"success": False, "message": f"Application launch failed: {e}"}
     
+    @classmethod
+    def _find_code_cli(cls) -> Optional[str]:
+        """Resolve the VS Code CLI once per process (re-probed only until it's found)."""
+        if cls._code_cli_path is None:
+            cls._code_cli_path = shutil.which("code")
+        return cls._code_cli_path
+
     def _open_file_in_ide(self, ide: str, filename: str) -> Dict[str, Any]:
         """Open file in specified IDE."""
         try:
             desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
             file_path = os.path.join(desktop_path, filename)
             
-            # Launch IDE with file
+            # Launch IDE with file; the launcher is resolved first so a missing one is reported
             if ide.lower() in ["vscode", "code", "visual studio code"]:
-                command = f'code "{file_path}"'
+                code_path = self._find_code_cli()
+                if not code_path:
+                    return {"success": False, "message": "VS Code not found. Please ensure VS Code is installed and in PATH."}
+                args = [code_path, file_path]
             else:
-                command = f'start "{file_path}"'
-            
-            result = subprocess.run(["powershell", "-Command", command], capture_output=True, text=True)
+                powershell = shutil.which("powershell")
+                if not powershell:
+                    return {"success": False, "message": f"Cannot open {filename}: PowerShell not found."}
+                args = [powershell, "-Command", f'start "{file_path}"']
+            
+            # Fire and forget: the editor/viewer launcher shouldn't block the plan
+            subprocess.Popen(
+                args,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                creationflags=_DETACHED_CREATIONFLAGS
+            )
             
             return {
-                "success": result.returncode == 0,
+                "success": True,
                 "message": f"Opened {filename} in {ide}",
                 "file_path": file_path
             }
@@ -695,7 +650,8 @@ class AdvancedTaskExecutor:
             
             # Take screenshot
             screenshot = pyautogui.screenshot()
-            screenshot.save(screenshot_path)
+            # Deleted right after analysis: fastest zlib level, size barely matters
+            screenshot.save(screenshot_path, compress_level=1)
             
             print(f"[Visual] 📸 Temporary screenshot for AI analysis: {filename}")
             return screenshot_path
@@ -716,11 +672,6 @@ class AdvancedTaskExecutor:
     def _analyze_screenshot_with_ai(self, screenshot_path: str, expected_action: str) -> Dict[str, Any]:
         """Use AI to analyze screenshot and determine if action succeeded."""
         try:
-            # Convert screenshot to base64 for AI analysis
-            import base64
-            with open(screenshot_path, "rb") as img_file:
-                img_base64 = base64.b64encode(img_file.read()).decode()
-            
             # Use vision AI to analyze the screenshot
             from core.llm import http_session
             from config import OLLAMA_URL, RESPONDER_MODEL
@@ -850,10 +801,11 @@ class AdvancedTaskExecutor:
         try:
             # Close common applications
             import psutil
-            for proc in psutil.process_iter(['pid', 'name']):
+            # Only the name is prefetched (process_iter reads requested attrs in one oneshot()
+            # pass per process; the pid is always known without a read)
+            for proc in psutil.process_iter(['name']):
                 try:
-                    proc_name = proc.info['name'].lower()
-                    if any(app in proc_name for app in ['code', 'chrome', 'firefox', 'notepad', 'explorer']):
+                    if _CLEANUP_PROCESS_RE.search((proc.info['name'] or '').lower()):
                         proc.terminate()
                 except:
                     pass
@@ -955,190 +907,15 @@ class AdvancedTaskExecutor:
             print(f"[AI Content] Failed to generate HTML, using template: {e}")
         
         # Fallback to template
-        return """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>My Portfolio</title>
-    <link rel="stylesheet" href="styles.css">
-</head>
-<body>
-    <header>
-        <h1>Welcome to My Portfolio</h1>
-        <nav>
-            <ul>
-                <li><a href="#about">About</a></li>
-                <li><a href="#projects">Projects</a></li>
-                <li><a href="#contact">Contact</a></li>
-            </ul>
-        </nav>
-    </header>
-    
-    <main>
-        <section id="about">
-            <h2>About Me</h2>
-            <p>I am a passionate developer creating amazing web experiences.</p>
-        </section>
-        
-        <section id="projects">
-            <h2>Projects</h2>
-            <div class="project-grid">
-                <div class="project">
-                    <h3>Project 1</h3>
-                    <p>Description of my first project.</p>
-                </div>
-                <div class="project">
-                    <h3>Project 2</h3>
-                    <p>Description of my second project.</p>
-                </div>
-            </div>
-        </section>
-        
-        <section id="contact">
-            <h2>Contact</h2>
-            <p>Email: contact@example.com</p>
-        </section>
-    </main>
-    
-    <script src="script.js"></script>
-</body>
-</html>"""
+        return _load_template("portfolio/index.html")
 
     def _generate_css_content(self, entities: Dict) -> str:
         """Generate CSS content for portfolio website."""
-        return """* {
-    margin: 0;
-    padding: 0;
-    box-sizing: border-box;
-}
-
-body {
-    font-family: 'Arial', sans-serif;
-    line-height: 1.6;
-    color: #333;
-}
-
-header {
-    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-    color: white;
-    padding: 2rem 0;
-    text-align: center;
-}
-
-header h1 {
-    margin-bottom: 1rem;
-    font-size: 2.5rem;
-}
-
-nav ul {
-    list-style: none;
-    display: flex;
-    justify-content: center;
-    gap: 2rem;
-}
-
-nav a {
-    color: white;
-    text-decoration: none;
-    font-weight: bold;
-}
-
-nav a:hover {
-    text-decoration: underline;
-}
-
-main {
-    max-width: 1200px;
-    margin: 0 auto;
-    padding: 2rem;
-}
-
-section {
-    margin-bottom: 3rem;
-}
-
-h2 {
-    color: #333;
-    margin-bottom: 1rem;
-    font-size: 2rem;
-}
-
-.project-grid {
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-    gap: 2rem;
-}
-
-.project {
-    background: #f4f4f4;
-    padding: 1.5rem;
-    border-radius: 8px;
-    box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-}
-
-.project h3 {
-    color: #667eea;
-    margin-bottom: 0.5rem;
-}
-
-@media (max-width: 768px) {
-    nav ul {
-        flex-direction: column;
-        gap: 1rem;
-    }
-    
-    header h1 {
-        font-size: 2rem;
-    }
-}"""
+        return _load_template("portfolio/styles.css")
 
     def _generate_js_content(self, entities: Dict) -> str:
         """Generate JavaScript content for portfolio website."""
-        return """// Portfolio Website JavaScript
-document.addEventListener('DOMContentLoaded', function() {
-    // Smooth scrolling for navigation links
-    const navLinks = document.querySelectorAll('nav a');
-    
-    navLinks.forEach(link => {
-        link.addEventListener('click', function(e) {
-            e.preventDefault();
-            
-            const targetId = this.getAttribute('href');
-            const targetSection = document.querySelector(targetId);
-            
-            if (targetSection) {
-                targetSection.scrollIntoView({
-                    behavior: 'smooth'
-                });
-            }
-        });
-    });
-    
-    // Add animation to projects on scroll
-    const projects = document.querySelectorAll('.project');
-    
-    const observer = new IntersectionObserver((entries) => {
-        entries.forEach(entry => {
-            if (entry.isIntersecting) {
-                entry.target.style.opacity = '1';
-                entry.target.style.transform = 'translateY(0)';
-            }
-        });
-    }, {
-        threshold: 0.1
-    });
-    
-    projects.forEach(project => {
-        project.style.opacity = '0';
-        project.style.transform = 'translateY(20px)';
-        project.style.transition = 'opacity 0.6s ease, transform 0.6s ease';
-        observer.observe(project);
-    });
-    
-    // Simple contact form validation (if you add a form later)
-    console.log('Portfolio website loaded successfully!');
-});"""
+        return _load_template("portfolio/script.js")
 
 # Global instance
 advanced_executor = AdvancedTaskExecutor()
@@ -73,13 +73,14 @@ class BrowserAgent(QObject):
     def _run_loop(self):
         while self.running:
             # 1. Capture Screenshot
-            b64_img = self.controller.get_screenshot()
-            if not b64_img:
+            img_bytes = self.controller.get_screenshot()
+            if not img_bytes:
                 time.sleep(1)
                 continue
 
             # Update GUI with screenshot
-            self._emit_screenshot(b64_img)
+            self._emit_screenshot(img_bytes)
+            b64_img = base64.b64encode(img_bytes).decode("utf-8")
 
             # 2. Append screenshot to the LAST user message or as a new user message
             # Qwen VL expects image input.
@@ -191,12 +192,10 @@ class BrowserAgent(QObject):
                     # Reprompt anyway?
                     time.sleep(1)
 
-    def _emit_screenshot(self, b64_str):
+    def _emit_screenshot(self, img_bytes):
         try:
-            # Convert base64 to QImage
-            # QImage.fromData expects bytes
-            img_data = base64.b64decode(b64_str)
-            image = QImage.fromData(img_data)
+            # QImage.fromData takes the raw JPEG bytes directly
+            image = QImage.fromData(img_bytes)
             self.screenshot_updated.emit(image)
         except Exception as e:
             print(f"Image conversion error: {e}")
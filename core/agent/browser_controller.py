@@ -1,4 +1,3 @@
-import base64
 import time
 from playwright.sync_api import sync_playwright, Page, BrowserContext, Browser
 
@@ -8,6 +7,14 @@ class BrowserController:
     and capturing screenshots. Operates in a 1000x1000 coordinate space
     as expected by Qwen2.5/3-VL.
     """
+    # Click variants differ only in their Playwright kwargs; resolved with one dict lookup
+    _CLICK_ACTIONS = {
+        "left_click": {},
+        "right_click": {"button": "right"},
+        "middle_click": {"button": "middle"},
+        "triple_click": {"click_count": 3},
+    }
+
     def __init__(self, headless: bool = False, viewport_width: int = 1280, viewport_height: int = 720):
         self.headless = headless
         self.viewport_width = viewport_width
@@ -55,13 +62,14 @@ class BrowserController:
         self.browser = None
         self.playwright = None
 
-    def get_screenshot(self) -> str:
-        """Returns the current page screenshot as a base64 string."""
+    def get_screenshot(self) -> bytes:
+        """Returns the current page screenshot as raw JPEG bytes."""
         if not self.page:
-            return ""
+            return b""
         
-        screenshot_bytes = self.page.screenshot(type="jpeg", quality=70)
-        return base64.b64encode(screenshot_bytes).decode("utf-8")
+        # Kept in memory: the agent decodes these bytes for the GUI and only
+        # base64-encodes them once for the VLM request.
+        return self.page.screenshot(type="jpeg", quality=70)
 
     def _scale_coordinates(self, x: int, y: int):
         """Scales 1000x1000 coordinates to the actual viewport size."""
@@ -89,11 +97,11 @@ class BrowserController:
                 x, y = self._scale_coordinates(coords[0], coords[1])
                 self.page.mouse.move(x, y)
 
-        elif action_name == "left_click":
+        elif action_name in self._CLICK_ACTIONS:
             coords = params.get("coordinate")
             if coords:
                 x, y = self._scale_coordinates(coords[0], coords[1])
-                self.page.mouse.click(x, y)
+                self.page.mouse.click(x, y, **self._CLICK_ACTIONS[action_name])
 
         elif action_name == "left_click_drag":
             # "Click and drag the cursor to a specified (x, y) pixel coordinate"
@@ -108,30 +116,12 @@ class BrowserController:
                 # 3. Mouse up
                 self.page.mouse.up()
 
-        elif action_name == "right_click":
-            coords = params.get("coordinate")
-            if coords:
-                x, y = self._scale_coordinates(coords[0], coords[1])
-                self.page.mouse.click(x, y, button="right")
-
-        elif action_name == "middle_click":
-            coords = params.get("coordinate")
-            if coords:
-                x, y = self._scale_coordinates(coords[0], coords[1])
-                self.page.mouse.click(x, y, button="middle")
-
         elif action_name == "double_click":
             coords = params.get("coordinate")
             if coords:
                 x, y = self._scale_coordinates(coords[0], coords[1])
                 self.page.mouse.dblclick(x, y)
 
-        elif action_name == "triple_click":
-            coords = params.get("coordinate")
-            if coords:
-                x, y = self._scale_coordinates(coords[0], coords[1])
-                self.page.mouse.click(x, y, click_count=3)
-
         elif action_name == "type":
             text = params.get("text")
             if text:
@@ -5,8 +5,13 @@ from typing import List, Dict, Any, Generator
 
 from core.settings_store import settings as app_settings
 from core.privacy_tracker import privacy_tracker
+from core.llm import json_loads
 from config import WEB_AGENT_MODEL
 
+_TOOL_CALL_RE = re.compile(r"<tool_call>\s*(.*?)\s*</tool_call>", re.DOTALL)
+# Curly double quotes some models emit inside JSON, normalised in one pass
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"'})
+
 class VLMClient:
     """
     Client for interacting with Qwen3-VL (or similar) models via Ollama.
@@ -118,7 +123,7 @@ class VLMClient:
             
             for line in response.iter_lines():
                 if line:
-                    data = json.loads(line.decode('utf-8'))
+                    data = json_loads(line)
                     msg = data.get("message", {})
                     
                     # 1. Handle "thinking" field (Qwen/DeepSeek reasoning models)
@@ -201,8 +206,7 @@ class VLMClient:
         Robustly extracts the JSON action from <tool_call> tags or raw text.
         """
         # 1. Try to find <tool_call> tags
-        pattern = r"<tool_call>\s*(.*?)\s*</tool_call>"
-        match = re.search(pattern, response_text, re.DOTALL)
+        match = _TOOL_CALL_RE.search(response_text)
         
         candidates = []
         if match:
@@ -212,7 +216,7 @@ class VLMClient:
         candidates.extend(self._extract_json_candidates(response_text))
         
         for json_str in candidates:
-            json_str = json_str.replace("“", '"').replace("”", '"')
+            json_str = json_str.translate(_SMART_QUOTES)
             
             try:
                 data = json.loads(json_str)
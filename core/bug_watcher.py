@@ -2,9 +2,19 @@
 Bug Watcher logic - The Proactive Layer.
 Watches the screen in a background thread for application crashes or terminal errors.
 """
+import os
+import re
+import sys
+import math
 import time
+import ctypes
+import hashlib
+import functools
 import threading
-from typing import Optional
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
 try:
     import pyautogui  
 except ImportError:
@@ -18,6 +28,73 @@ try:
 except ImportError:
     pytesseract = None
 
+try:
+    # In-process Tesseract: the engine stays loaded between calls instead of a process
+    # spawn, temp-file round trip and model reload per OCR call
+    import tesserocr  
+except ImportError:
+    tesserocr = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    # SIMD colour conversion, resampling and thresholding for OCR preprocessing
+    import cv2
+except ImportError:
+    cv2 = None
+
+try:
+    # Reads the framebuffer directly (XShm/CoreGraphics/GDI) instead of forking a capture tool
+    import mss  
+except ImportError:
+    mss = None
+
+# SetWinEventHook constants for the Windows foreground-change hook
+_EVENT_SYSTEM_FOREGROUND = 0x0003
+_WINEVENT_OUTOFCONTEXT = 0x0000
+_WM_QUIT = 0x0012
+# MessageBoxW flags for the Windows alert fallback
+_MB_ICONWARNING = 0x30
+_MB_SYSTEMMODAL = 0x1000
+# Notification helpers are launched and forgotten: own session, no inherited pipes
+_DETACHED_POPEN_KWARGS = {
+    "start_new_session": True,
+    "stdin": subprocess.DEVNULL,
+    "stdout": subprocess.DEVNULL,
+    "stderr": subprocess.DEVNULL,
+}
+
+def _notify_native(title: str, message: str):
+    """Fire-and-forget OS notification, used when the HUD window isn't available."""
+    try:
+        if os.name == 'nt':
+            # MessageBoxW blocks until dismissed, so it gets its own thread
+            threading.Thread(
+                target=ctypes.windll.user32.MessageBoxW,  
+                args=(None, message, title, _MB_ICONWARNING | _MB_SYSTEMMODAL),
+                daemon=True
+            ).start()
+        elif sys.platform == "darwin":
+            safe_message = message.replace("\\", "\\\\").replace('"', '\\"')
+            script = f'display notification "{safe_message}" with title "{title}"'
+            subprocess.Popen(["osascript", "-e", script], **_DETACHED_POPEN_KWARGS)
+        else:
+            subprocess.Popen(["notify-send", title, message], **_DETACHED_POPEN_KWARGS)
+    except Exception as e:
+        print(f"[Proactive Layer] Could not show notification: {e}")
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_tess_config(config: str) -> Tuple[int, int, Tuple[Tuple[str, str], ...]]:
+    """Split a pytesseract-style config string into (oem, psm, -c variables)."""
+    oem = int(re.search(r"--oem (\d+)", config).group(1))
+    psm = int(re.search(r"--psm (\d+)", config).group(1))
+    return oem, psm, tuple(re.findall(r"-c (\w+)=(\S+)", config))
+
+
 class BugWatcher:
     """Watches the screen asynchronously via OCR to pre-emptively detect bugs."""
     def __init__(self):
@@ -27,40 +104,384 @@ class BugWatcher:
         
         # Keywords to look for
         self.alert_keywords = ["exception", "traceback (most recent call last)", "fatal error", "syntaxerror", "referenceerror", "typeerror"]
+        # All keywords compiled into one pattern, rebuilt only when the list changes
+        self._alert_pattern: Optional["re.Pattern[str]"] = None
+        self._alert_pattern_key: Optional[Tuple[str, ...]] = None
         
         # To avoid spamming the same error
         self.last_alerted_text = ""
         
+        # Tesseract configs: a single window is one uniform text block (psm 6, no layout
+        # analysis); the full desktop is scattered text (psm 11)
+        self._tess_window_config = '--oem 1 --psm 6 -c preserve_interword_spaces=1'
+        self._tess_screen_config = '--oem 1 --psm 11'
+        # Wider frames are downscaled before OCR; text stays legible at ~1600px for normal UI fonts
+        self.max_ocr_width = 1600
+        # Tesseract language(s), e.g. "eng" or "eng+deu"
+        self.ocr_language = "eng"
+        # Binarize frames before OCR (needs OpenCV): Tesseract is both faster and more accurate
+        # on clean black-on-white input than on anti-aliased, themed UI
+        self.ocr_binarize = True
+        # Opt-in: cap Tesseract at one OpenMP thread, since bands and regions are already OCR'd
+        # in parallel. Applied by start() via OMP_THREAD_LIMIT, which is process-wide: it also
+        # limits faster-whisper/CTranslate2 and any child process, so it is off by default.
+        self.ocr_single_thread = False
+        
+        # Digest of the last OCR'd frame, so idle screens skip Tesseract entirely
+        self._last_frame_digest: Optional[bytes] = None
+        
+        # The OCR'd frame is split into horizontal bands (overlapping by about one text line so
+        # a line on a boundary is whole in at least one band). Each band's digest and text are
+        # kept so only bands whose pixels changed go back through Tesseract.
+        self.ocr_band_height = 256
+        self.ocr_band_overlap = 32
+        self._band_cache: Dict[int, Tuple[bytes, str]] = {}
+        self._band_frame_shape: Optional[Tuple[int, ...]] = None
+        
+        # mss handles are not thread-safe, so each scanning thread keeps its own
+        self._sct_local = threading.local()
+        
+        # tesserocr engines are per thread too, one per thread (the language model is loaded
+        # once; configs are switched in place). A long-lived OCR pool keeps them warm across
+        # scans; every engine is tracked so stop() can release it.
+        self._tess_local = threading.local()
+        self._tess_apis: list = []
+        self._tess_apis_lock = threading.Lock()
+        self._ocr_pool: Optional[ThreadPoolExecutor] = None
+        
+        # Set when the screen is known to have changed (foreground window switch) so the
+        # loop scans now instead of at the next tick.
+        # The settle delay lets the newly focused window finish painting first.
+        self._wake = threading.Event()
+        self.change_settle_delay = 0.5
+        self._hook_thread: Optional[threading.Thread] = None
+        self._hook_thread_id: Optional[int] = None
+        
     def start(self):
         if not self.running:
+            if self.ocr_single_thread:
+                os.environ.setdefault("OMP_THREAD_LIMIT", "1")
             self.running = True
             self._thread = threading.Thread(target=self._scan_loop, daemon=True)
             self._thread.start()  
+            if os.name == "nt":
+                self._hook_thread = threading.Thread(target=self._foreground_hook_loop, daemon=True)
+                self._hook_thread.start()
             print("[Proactive Layer] Bug Watcher started. Polling screen...")
 
     def stop(self):
         self.running = False
+        self._wake.set()
+        if self._hook_thread_id:
+            ctypes.windll.user32.PostThreadMessageW(self._hook_thread_id, _WM_QUIT, 0, 0)  
+            self._hook_thread_id = None
         if self._thread:
+            # The scan thread releases the OCR pool and engines itself once its pass ends,
+            # so a scan still running past this timeout never sees its engine ended under it
             self._thread.join(timeout=2)  
-            print("[Proactive Layer] Bug Watcher stopped.")
+            if self._thread.is_alive():
+                print("[Proactive Layer] Bug Watcher stopping after the current scan.")
+            else:
+                print("[Proactive Layer] Bug Watcher stopped.")
+
+    def _release_ocr(self):
+        """Shut down the OCR pool and end every tesserocr engine; only once no scan is running."""
+        with self._tess_apis_lock:
+            if self._ocr_pool:
+                self._ocr_pool.shutdown(wait=True)
+                self._ocr_pool = None
+            for api in self._tess_apis:
+                api.End()
+            self._tess_apis.clear()
+            self._tess_local = threading.local()  # Drop every thread's handle to the ended engines
+
+    def _wait_for_change(self, timeout: float) -> bool:
+        """Sleep until the next interval or an earlier screen-change notification.
+
+        Returns True if a notification cut the wait short.
+        """
+        woken = self._wake.wait(timeout)
+        if woken and self.running:
+            time.sleep(self.change_settle_delay)
+        self._wake.clear()
+        return woken
+
+    def _wait_for_next_tick(self, next_tick: float) -> float:
+        """Wait for the next scan deadline (or an earlier screen change) and return it.
+
+        Deadlines advance by whole intervals on the monotonic clock, so the time spent
+        on OCR doesn't stretch the period, and a pass that overruns skips the ticks it
+        missed instead of scanning back-to-back to catch up.
+        """
+        next_tick += self.interval
+        now = time.monotonic()
+        if next_tick < now:
+            next_tick += math.ceil((now - next_tick) / self.interval) * self.interval
+        if self._wait_for_change(next_tick - now):
+            # Scanning early for the change; the cadence restarts from here
+            next_tick = time.monotonic()
+        return next_tick
+
+    def _foreground_hook_loop(self):
+        """Windows only: wake the scanner whenever the foreground window changes."""
+        from ctypes import wintypes
+        # Private handle so the prototypes below don't leak into the shared ctypes.windll.user32
+        user32 = ctypes.WinDLL("user32")  
+        win_event_proc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+        # HWINEVENTHOOK is pointer-sized; the default int restype would truncate it on 64-bit
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        user32.SetWinEventHook.argtypes = [
+            wintypes.UINT, wintypes.UINT, wintypes.HMODULE, win_event_proc,
+            wintypes.DWORD, wintypes.DWORD, wintypes.UINT
+        ]
+        user32.UnhookWinEvent.restype = wintypes.BOOL
+        user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+
+        def _on_event(hook, event, hwnd, id_object, id_child, thread_id, event_time):
+            self._wake.set()
+
+        callback = win_event_proc(_on_event)  # Must stay referenced while the hook is installed
+        hook = user32.SetWinEventHook(
+            _EVENT_SYSTEM_FOREGROUND, _EVENT_SYSTEM_FOREGROUND, 0, callback, 0, 0, _WINEVENT_OUTOFCONTEXT
+        )
+        if not hook:
+            print("[Proactive Layer] Foreground hook unavailable, using interval polling only.")
+            return
+
+        self._hook_thread_id = ctypes.windll.kernel32.GetCurrentThreadId()  
+        msg = wintypes.MSG()
+        # Out-of-context hooks are delivered through this thread's message queue
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        user32.UnhookWinEvent(hook)
+
+    def _get_ocr_pool(self) -> ThreadPoolExecutor:
+        """Shared worker pool for parallel OCR (created on first use)."""
+        with self._tess_apis_lock:
+            if self._ocr_pool is None:
+                # One worker per core (calls are single-threaded when ocr_single_thread is on)
+                self._ocr_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4), thread_name_prefix="bug-watcher-ocr")
+            return self._ocr_pool
+
+    def _tesserocr_api(self, config: str):
+        """This thread's warm tesserocr engine, switched to a pytesseract-style config string.
+
+        Each thread keeps a single engine for the current language, so the model is loaded
+        once rather than once per config. Page segmentation mode and -c variables are
+        cheap to change in place; variables the previous config set are put back to their
+        defaults. A language (or OEM) change rebuilds the engine.
+        """
+        oem, psm, variables = _parse_tess_config(config)
+        key = (self.ocr_language, oem)
+        state = getattr(self._tess_local, "state", None)
+        if state is None or state["key"] != key:
+            api = tesserocr.PyTessBaseAPI(lang=self.ocr_language, oem=oem)
+            with self._tess_apis_lock:
+                if state is not None:
+                    state["api"].End()
+                    self._tess_apis.remove(state["api"])
+                self._tess_apis.append(api)
+            state = self._tess_local.state = {"key": key, "api": api, "config": None, "defaults": {}}
+
+        api = state["api"]
+        if state["config"] != config:
+            api.SetPageSegMode(psm)
+            wanted = dict(variables)
+            defaults = state["defaults"]
+            for name, default in defaults.items():
+                if name not in wanted:
+                    api.SetVariable(name, default)
+            for name, value in wanted.items():
+                if name not in defaults:
+                    default = api.GetVariableAsString(name)
+                    if default is not None:
+                        defaults[name] = default
+                api.SetVariable(name, value)
+            state["config"] = config
+        return api
+
+    def _image_to_text(self, image, config: str) -> str:
+        """OCR a PIL image or uint8 array to lowercase text, in-process via tesserocr when installed."""
+        if tesserocr:
+            api = self._tesserocr_api(config)
+            if np is not None and isinstance(image, np.ndarray):
+                # Raw pixels straight in; SetImage would first re-encode a PIL image
+                image = np.ascontiguousarray(image)
+                height, width = image.shape[:2]
+                channels = 1 if image.ndim == 2 else image.shape[2]
+                api.SetImageBytes(image.tobytes(), width, height, channels, width * channels)
+            else:
+                api.SetImage(image)
+            return api.GetUTF8Text().lower()
+        return pytesseract.image_to_string(image, lang=self.ocr_language, config=config).lower()
+
+    def _active_window_region(self) -> Optional[Tuple[int, int, int, int]]:
+        """Return the focused window as an (x, y, w, h) region clipped to the screen, if known."""
+        try:
+            window = pyautogui.getActiveWindow()
+        except Exception:
+            return None
+        if not window:
+            return None
+
+        screen_w, screen_h = pyautogui.size()
+        left = max(0, window.left)
+        top = max(0, window.top)
+        right = min(screen_w, window.left + window.width)
+        bottom = min(screen_h, window.top + window.height)
+        if right - left < 50 or bottom - top < 50:
+            return None  # Minimized or degenerate window, scan the whole screen instead
+        return (left, top, right - left, bottom - top)
+
+    def _grab(self, region: Optional[Tuple[int, int, int, int]] = None):
+        """Screenshot the (x, y, w, h) region, or the whole desktop, as a PIL RGB image."""
+        if not mss:
+            return pyautogui.screenshot(region=region)
+
+        sct = getattr(self._sct_local, "sct", None)
+        if sct is None:
+            sct = self._sct_local.sct = mss.mss()
+        if region:
+            monitor = {"left": region[0], "top": region[1], "width": region[2], "height": region[3]}
+        else:
+            monitor = sct.monitors[1]  # Primary display, matching pyautogui.screenshot()
+        raw = sct.grab(monitor)
+        # Decode the native BGRA buffer in C. ScreenShot.rgb would first build a converted
+        # copy in Python, and .bgra another copy of the raw buffer.
+        return Image.frombuffer("RGB", raw.size, raw.raw, "raw", "BGRX", 0, 1)
+
+    def _capture(self):
+        """Capture the active window when possible; OCR cost scales with pixel count.
+
+        Returns the image and the Tesseract config suited to what was captured.
+        """
+        region = self._active_window_region()
+        if region:
+            return self._grab(region), self._tess_window_config
+        return self._grab(), self._tess_screen_config
+
+    def _frame_digest(self, screenshot) -> Optional[bytes]:
+        """Cheap fingerprint of a frame from a strided pixel sample (every 16th row/column).
+
+        Nearest-neighbour downsampling picks the sample straight from the PIL frame, so
+        the full-resolution pixel array is never copied out just to be hashed.
+        """
+        width, height = screenshot.size
+        if width < 16 or height < 16:
+            return None
+        sample = screenshot.resize((width // 16, height // 16), Image.NEAREST)
+        return hashlib.blake2b(sample.tobytes(), digest_size=16).digest()
+
+    def _prepare_for_ocr(self, image):
+        """Grayscale, cap the width and (with OpenCV) binarize before OCR; Tesseract time scales with pixel count.
+
+        Returns a 2-D uint8 array when numpy is available (handed to Tesseract without
+        going back through PIL), otherwise a PIL image.
+        """
+        if cv2 is not None and np is not None and image.mode == "RGB":
+            gray = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2GRAY)
+            height, width = gray.shape
+            if width > self.max_ocr_width:
+                size = (self.max_ocr_width, int(height * self.max_ocr_width / width))
+                gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+            if self.ocr_binarize:
+                if gray.mean() < 128:
+                    gray = cv2.bitwise_not(gray)
+                # Local-mean threshold, robust to gradients and mixed light/dark panels
+                gray = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, 31, 10)
+            return gray
+
+        image = image.convert("L")
+        width, height = image.size
+        if width > self.max_ocr_width:
+            image = image.resize((self.max_ocr_width, int(height * self.max_ocr_width / width)), Image.LANCZOS)
+        # Without OpenCV the frame goes to Tesseract unbinarized, which does its own thresholding
+        return image if np is None else np.asarray(image)
+
+    def _ocr_frame(self, image, config: str) -> str:
+        """OCR a prepared frame band by band, re-running Tesseract only on bands that changed."""
+        if np is None:
+            return self._image_to_text(image, config)
+
+        frame = np.asarray(image)
+        if frame.shape != self._band_frame_shape:
+            # Different window or size: band offsets no longer line up with the cache
+            self._band_cache = {}
+            self._band_frame_shape = frame.shape
+
+        height = frame.shape[0]
+        bands = {}
+        dirty = []
+        for top in range(0, height, self.ocr_band_height):
+            band = frame[top:min(height, top + self.ocr_band_height + self.ocr_band_overlap)]
+            digest = hashlib.blake2b(np.ascontiguousarray(band), digest_size=16).digest()
+            cached = self._band_cache.get(top)
+            if cached and cached[0] == digest:
+                bands[top] = cached[1]
+            else:
+                dirty.append((top, band, digest))
+
+        def _ocr(item) -> str:
+            return self._image_to_text(item[1], config)
+
+        if dirty:
+            # Tesseract releases the GIL (or runs out of process), so changed bands are recognised in parallel
+            for (top, _, digest), text in zip(dirty, self._get_ocr_pool().map(_ocr, dirty)):
+                self._band_cache[top] = (digest, text)
+                bands[top] = text
+
+        return "\n".join(bands[top] for top in sorted(bands))
+
+    def _find_alert_keyword(self, text: str) -> Optional[str]:
+        """First alert keyword (in list order) that occurs in the text, if any.
+
+        Most frames contain none, so one pass of the combined pattern settles that case;
+        only a frame that matches is checked keyword by keyword to keep list priority.
+        """
+        key = tuple(self.alert_keywords)
+        if key != self._alert_pattern_key:
+            self._alert_pattern = re.compile("|".join(re.escape(k) for k in key)) if key else None
+            self._alert_pattern_key = key
+        if self._alert_pattern is None or not self._alert_pattern.search(text):
+            return None
+        for keyword in key:
+            if keyword in text:
+                return keyword
+        return None
 
     def _scan_loop(self):
+        try:
+            self._scan_until_stopped()
+        finally:
+            # A quick stop()/start() may already have handed the resources to a new scan thread
+            if self._thread is threading.current_thread():
+                self._release_ocr()
+
+    def _scan_until_stopped(self):
+        next_tick = time.monotonic()
         while self.running:
             if pyautogui and pytesseract:
                 try:
-                    # 1. Capture the screen
-                    screenshot = pyautogui.screenshot()
+                    # 1. Capture the screen (focused window only when we can find it)
+                    screenshot, tess_config = self._capture()
+                    
+                    digest = self._frame_digest(screenshot)
+                    if digest is not None and digest == self._last_frame_digest:
+                        # Screen unchanged since the last pass, OCR would find the same text
+                        next_tick = self._wait_for_next_tick(next_tick)
+                        continue
                     
-                    # 2. Extract text (using fast/sparse OCR parameters)
-                    # --psm 11 looks for sparse text, which is faster than full page layouts
-                    ocr_text = pytesseract.image_to_string(screenshot, config='--psm 11').lower()
+                    # 2. Extract text (page segmentation mode picked to skip needless layout analysis)
+                    ocr_text = self._ocr_frame(self._prepare_for_ocr(screenshot), tess_config)
                     
                     # 3. Analyze text for crash signatures
-                    detected_error: Optional[str] = None
-                    for keyword in self.alert_keywords:
-                        if keyword in ocr_text:
-                            detected_error = keyword
-                            break
+                    detected_error = self._find_alert_keyword(ocr_text)
+                    # Only now is the frame fully processed; if OCR raised, it is retried next pass
+                    self._last_frame_digest = digest
                     
                     if detected_error:
                         # Extract a snippet around the error to show in HUD
@@ -69,7 +490,7 @@ class BugWatcher:
                         
                         if snippet != self.last_alerted_text:
                             self.last_alerted_text = snippet
-                            err_tag = str(detected_error).upper()
+                            err_tag = detected_error.upper()
                             print(f"[Proactive Layer] 🔥 CRASH SIGNATURE DETECTED: {err_tag}")
                             
                             # Use VisionAgent for deeper analysis to confirm and describe the crash
@@ -83,14 +504,20 @@ class BugWatcher:
                                 self.last_alerted_text = snippet
                                 print(f"[Proactive Layer] 👁️ VISION CONFIRMED: {snippet}")
                                 
-                                # Trigger HUD if initialized
+                                # Trigger HUD if initialized, otherwise a native OS notification
                                 try:
-                                    from gui.windows.hud_window import hud_window  
+                                    try:
+                                        from gui.windows.hud_window import hud_window  
+                                    except ImportError:
+                                        hud_window = None
                                     if hud_window:
-                                        hud_window.show_alert(f"BUG DETECTED: {detected_error.upper()}")  
+                                        hud_window.show_alert(f"BUG DETECTED: {err_tag}")  
                                         # Also speak it if TTS is available
                                         from core.tts import tts 
                                         tts.speak(f"Alert. I've detected a {detected_error} in an application window. {snippet}")
+                                    else:
+                                        # HUD missing or not started yet
+                                        _notify_native("Wolf AI: Bug Detected", f"{err_tag}: {snippet}")
                                 except Exception:
                                     pass
                             
@@ -99,7 +526,7 @@ class BugWatcher:
                     print(f"[Proactive Layer] OCR Error: {e}")
                     time.sleep(30) # Wait longer before trying again if broken
             
-            time.sleep(self.interval)
+            next_tick = self._wait_for_next_tick(next_tick)
 
 # Singleton
 bug_watcher = BugWatcher()
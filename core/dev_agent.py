@@ -4,13 +4,52 @@ Handles interactive project scaffolding and actual code generation using Ollama.
 """
 
 import os
+import json
 import subprocess
 import requests  
 import re
 import shutil
-from typing import Dict, Any
+import hashlib
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
 from config import OLLAMA_URL, RESPONDER_MODEL  
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # Optional: cached responses fall back to zlib
+
+# Resolved tool paths. Only hits are cached so a tool installed mid-session
+# (e.g. Node.js after we suggest it) is found on the next attempt.
+_executable_cache: Dict[str, str] = {}
+
+
+def _find_executable(name: str) -> Optional[str]:
+    """shutil.which with a process-lifetime cache of successful lookups."""
+    path = _executable_cache.get(name)
+    if path is None:
+        path = shutil.which(name)
+        if path:
+            _executable_cache[name] = path
+    return path
+
+# Markdown fences a model may wrap around file contents despite being told not to:
+# an opening ```lang line or a closing ``` line
+_CODE_FENCE_RE = re.compile(r"^```[a-zA-Z]*\n|\n```$", re.MULTILINE)
+# The same fences, matched one (stripped) line at a time while streaming
+_FENCE_LINE_RE = re.compile(r"```[a-zA-Z]*")
+
+# Content-addressed cache of LLM responses, keyed by model + options + prompt
+AI_CACHE_DIR = "data/ai_cache"
+_AI_CACHE_SUFFIX = ".zst" if zstandard else ".zlib"
+# Entries older than this are regenerated; past the entry cap the oldest are evicted
+AI_CACHE_TTL = 7 * 24 * 3600
+AI_CACHE_MAX_ENTRIES = 200
+
+
 class DevAgent:
     def __init__(self, workspace_dir: str = "./workspace"):
         self.workspace_dir = os.path.abspath(workspace_dir)
@@ -18,10 +57,13 @@ class DevAgent:
         self.active_session = False
         self.collected_requirements = ""
         self.project_name = "wolf_project"
+        # One pooled connection to Ollama for the evaluation + code generation calls
+        self.http_session = requests.Session()
         
-    def scaffold_project(self, prompt: str, framework: str = "html") -> Dict[str, Any]:
+    def scaffold_project(self, prompt: str, framework: str = "html", regenerate: bool = False) -> Dict[str, Any]:
         """
         Interactively scaffolds a project. Asks questions if details are sparse.
+        Pass regenerate=True to skip cached generations and ask the model again.
         """
         # Ensure project name is extracted from prompt if possible
         if "named" in prompt.lower():
@@ -38,24 +80,30 @@ class DevAgent:
         print(f"[DevAgent] Current Requirements: {self.collected_requirements}")
         
         # Step 1: Ask LLM if we have enough info to build
+        if self._detect_framework(self.collected_requirements) == "html":
+            # A plain HTML build needs exactly one page, so a ready answer carries it straight
+            # away instead of costing a second call. Questions stay short.
+            ready_rule = 'reply with "READY_TO_BUILD" on its own first line, followed by a professional, beautiful standalone HTML file. Include deep CSS and JavaScript in the same file. It must fulfill every specific detail in the requirements, including specified titles, sections, and brand colors. Output ONLY raw code after that first line, with NO formatting blocks like ```html.'
+            eval_timeout = 120
+        else:
+            ready_rule = 'reply with EXACTLY the word "READY_TO_BUILD".'
+            eval_timeout = 30
         eval_prompt = f"""
         You are Wolf AI's elite Developer Agent. The user wants to build a software project.
         Current accumulated requirements from user: "{self.collected_requirements}"
         
         Evaluate these requirements. 
         If the requirements are very vague (e.g., "build a web", "make an app"), ask exactly ONE natural follow-up question to clarify (e.g., "What framework would you like to use, like React or NextJS, and what is the main purpose of the app?"). Do not say anything else.
-        If the requirements are sufficiently detailed (contains a framework like html, react, or python, AND a specific purpose/app idea), reply with EXACTLY the word "READY_TO_BUILD".
+        If the requirements are sufficiently detailed (contains a framework like html, react, or python, AND a specific purpose/app idea), {ready_rule}
         """
         
+        prefetched_html = None
         try:
-            response = requests.post(f"{OLLAMA_URL}/generate", json={
-                "model": RESPONDER_MODEL,
-                "prompt": eval_prompt,
-                "stream": False
-            }, timeout=30)
+            # Never cached: the answer has to follow the conversation, not repeat itself
+            raw = self._generate(eval_prompt, timeout=eval_timeout)
             
-            if response.status_code == 200:
-                answer = response.json().get("response", "").strip()
+            if raw is not None:
+                answer, prefetched_html = self._parse_evaluation(raw)
             else:
                 answer = "READY_TO_BUILD" # Fallback
                 
@@ -84,18 +132,13 @@ class DevAgent:
             target_dir = os.path.join(self.workspace_dir, self.project_name)
             
             # Determine actual framework intended (LLM could do this, but we fallback to substring)
-            if "react" in final_reqs.lower() or "vite" in final_reqs.lower():
-                actual_fw = "react"
-            elif "python" in final_reqs.lower() or "api" in final_reqs.lower():
-                actual_fw = "python"
-            else:
-                actual_fw = "html"
+            actual_fw = self._detect_framework(final_reqs)
 
             if actual_fw == "react":
                 print("[DevAgent] Using Vite to scaffold React app...")
                 
                 # Pre-flight check for npm/Node.js
-                if not shutil.which("npm"):
+                if not _find_executable("npm"):
                     return {
                         "success": False,
                         "message": "It looks like Node.js (npm) is not installed on your computer. You need it to build React apps. Would you like me to open the Node.js website for you to download it?"
@@ -126,15 +169,13 @@ class DevAgent:
                 
             elif actual_fw == "python":
                 print("[DevAgent] Scaffolding Python app...")
-                os.makedirs(os.path.join(target_dir, "src"), exist_ok=True)
                 
-                self._generate_and_write_file(
-                    final_reqs,
-                    os.path.join(target_dir, "src", "main.py"),
-                    "Write a complete, documented Python script/app meeting these requirements. Output ONLY the raw Python code."
-                )
-                with open(os.path.join(target_dir, "requirements.txt"), "w") as f:
-                    f.write("# Add your python dependencies here\\n")
+                # The generation call also creates src/
+                self._generate_and_write_files(final_reqs, target_dir, {
+                    "src/main.py": "a complete, documented Python script/app meeting these requirements."
+                }, refresh=regenerate)
+                # Static: a generated dependency list could name packages that don't exist
+                Path(target_dir, "requirements.txt").write_text("# Add your python dependencies here\n", encoding="utf-8")
                     
                 final_status = f"✅ **Python App Scaffolded!**\\nYour script is ready at: `{target_dir}/src/main.py`"
                 
@@ -142,19 +183,24 @@ class DevAgent:
                 print("[DevAgent] Scaffolding HTML app...")
                 os.makedirs(target_dir, exist_ok=True)
                 
-                # HTML
-                self._generate_and_write_file(
-                    final_reqs,
-                    os.path.join(target_dir, "index.html"),
-                    "Write a professional, beautiful standalone HTML file. Include deep CSS and JavaScript in the same file. It must fulfill every specific detail in the requirements, including specified titles, sections, and brand colors. Output ONLY raw code."
-                )
+                # HTML (usually already written by the readiness check)
+                index_path = os.path.join(target_dir, "index.html")
+                if prefetched_html:
+                    self._write_generated_file((index_path, prefetched_html))
+                else:
+                    self._generate_and_write_file(
+                        final_reqs,
+                        index_path,
+                        "Write a professional, beautiful standalone HTML file. Include deep CSS and JavaScript in the same file. It must fulfill every specific detail in the requirements, including specified titles, sections, and brand colors. Output ONLY raw code."
+                    )
                 
                 final_status = f"✅ **HTML/JS App Scaffolded!**\\nYour webpage is ready at: `{target_dir}/index.html`"
 
             # Auto-open the project in VS Code!
-            if shutil.which("code"):
+            code_path = _find_executable("code")
+            if code_path:
                 print("[DevAgent] Opening project in VS Code...")
-                subprocess.Popen("code .", cwd=target_dir, shell=True)
+                subprocess.Popen([code_path, "."], cwd=target_dir)
                 final_status += "\\n*(I have also opened the project in VS Code for you!)*"
 
             return {
@@ -166,32 +212,232 @@ class DevAgent:
         except Exception as e:
             return {"success": False, "message": f"Dev Agent Build Error: {e}"}
 
+    def _generate(self, prompt: str, timeout: int, **options) -> Optional[str]:
+        """Non-streaming /generate call. Returns the response text, or None on an error status."""
+        response = self.http_session.post(f"{OLLAMA_URL}/generate", json={
+            "model": RESPONDER_MODEL,
+            "prompt": prompt,
+            "stream": False,
+            **options
+        }, timeout=timeout)
+        if response.status_code != 200:
+            return None
+        return response.json().get("response", "")
+
+    def _cached_generate(self, prompt: str, timeout: int, refresh: bool = False, **options) -> Optional[str]:
+        """_generate backed by the on-disk response cache.
+
+        Identical prompts (same model and options) are served from disk without a request.
+        refresh skips the lookup and overwrites the entry with a fresh response.
+        """
+        key = hashlib.blake2b(
+            json.dumps([RESPONDER_MODEL, options, prompt], sort_keys=True).encode("utf-8"),
+            digest_size=20
+        ).hexdigest()
+        if not refresh:
+            cached = self._cache_get(key)
+            if cached is not None:
+                print("[DevAgent] Using cached response")
+                return cached
+        
+        text = self._generate(prompt, timeout, **options)
+        if text is not None:
+            self._cache_put(key, text)
+        return text
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        path = Path(AI_CACHE_DIR) / (key + _AI_CACHE_SUFFIX)
+        try:
+            if time.time() - path.stat().st_mtime > AI_CACHE_TTL:
+                path.unlink()
+                return None
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            if zstandard:
+                data = zstandard.ZstdDecompressor().decompress(data)
+            else:
+                data = zlib.decompress(data)
+            return data.decode("utf-8")
+        except Exception:
+            return None  # Corrupt entry; it is overwritten on the next miss
+
+    def _cache_put(self, key: str, value: str):
+        data = value.encode("utf-8")
+        if zstandard:
+            data = zstandard.ZstdCompressor(level=3).compress(data)
+        else:
+            data = zlib.compress(data, 6)
+        try:
+            os.makedirs(AI_CACHE_DIR, exist_ok=True)
+            path = Path(AI_CACHE_DIR) / (key + _AI_CACHE_SUFFIX)
+            tmp_path = path.with_name(path.name + ".tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+            self._prune_cache()
+        except OSError as e:
+            print(f"[DevAgent] Could not write response cache: {e}")
+
+    def _prune_cache(self):
+        """Evict the oldest entries once the cache holds more than AI_CACHE_MAX_ENTRIES."""
+        entries = []
+        for entry in os.scandir(AI_CACHE_DIR):
+            if entry.name.endswith(_AI_CACHE_SUFFIX):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass
+        if len(entries) <= AI_CACHE_MAX_ENTRIES:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - AI_CACHE_MAX_ENTRIES]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _detect_framework(self, reqs: str) -> str:
+        """Framework the requirements ask for, by keyword: react, python, or html by default."""
+        lowered = reqs.lower()
+        if "react" in lowered or "vite" in lowered:
+            return "react"
+        if "python" in lowered or "api" in lowered:
+            return "python"
+        return "html"
+
+    def _parse_evaluation(self, raw: str) -> Tuple[str, Optional[str]]:
+        """Split the readiness reply into (answer, prefetched index.html).
+
+        A reply without READY_TO_BUILD is the follow-up question. Anything after the
+        READY_TO_BUILD line is the HTML page, when one was asked for.
+        """
+        marker = raw.upper().find("READY_TO_BUILD")
+        if marker < 0:
+            return raw.strip(), None
+        html = raw[marker + len("READY_TO_BUILD"):].strip()
+        return "READY_TO_BUILD", html if "<" in html else None
+
+    def _generate_and_write_files(self, reqs: str, target_dir: str, files: Dict[str, str], refresh: bool = False):
+        """Generate several project files with one LLM call returning a JSON object.
+
+        `files` maps each relative path to a short description of its content. Any file the
+        model leaves out (or an unparseable reply) falls back to a per-file generation call.
+        """
+        listing = "\n".join(f'- "{path}": {desc}' for path, desc in files.items())
+        prompt = (
+            "Generate the following project files.\n"
+            f"{listing}\n\nRequirements: {reqs}\n\n"
+            "Respond with ONE JSON object mapping each file path above to that file's complete raw "
+            "contents as a string. No markdown, no commentary."
+        )
+        print(f"[DevAgent] Generating {len(files)} files in one request...")
+        
+        generated: Dict[str, Any] = {}
+        try:
+            raw = self._cached_generate(prompt, timeout=120, refresh=refresh, format="json")
+            if raw is not None:
+                parsed = json.loads(raw or "{}")
+                if isinstance(parsed, dict):
+                    generated = parsed
+        except Exception as e:
+            print(f"[DevAgent] Batched generation failed, falling back to per-file: {e}")
+        
+        ready: Dict[str, str] = {}
+        missing = []
+        for rel_path, desc in files.items():
+            filepath = os.path.join(target_dir, *rel_path.split("/"))
+            content = generated.get(rel_path)
+            if isinstance(content, str) and content.strip():
+                ready[filepath] = content
+            else:
+                missing.append((filepath, desc))
+        
+        # Create each parent directory once (target_dir is implied by its subdirectories), then
+        # overlap the writes (file I/O releases the GIL)
+        created_dirs = set()
+        for filepath in [*ready, *(path for path, _ in missing)]:
+            directory = os.path.dirname(filepath)
+            if directory not in created_dirs:
+                os.makedirs(directory, exist_ok=True)
+                created_dirs.add(directory)
+        if len(ready) > 1:
+            with ThreadPoolExecutor(max_workers=min(4, len(ready))) as pool:
+                list(pool.map(self._write_generated_file, ready.items()))
+        else:
+            # A single write isn't worth spinning up a pool for
+            for item in ready.items():
+                self._write_generated_file(item)
+        
+        for filepath, desc in missing:
+            self._generate_and_write_file(reqs, filepath, f"Write {desc} Output ONLY the raw file contents.")
+
+    def _write_generated_file(self, item):
+        """Write one (filepath, content) pair produced by the batched generation."""
+        filepath, content = item
+        Path(filepath).write_text(_CODE_FENCE_RE.sub("", content).strip("`"), encoding="utf-8")
+        print(f"[DevAgent] ✓ Wrote {filepath}")
+
+    def _stream_generation_to_file(self, response, filepath: str):
+        """Write a streamed /generate response to disk line by line.
+
+        Cleans up as it goes, matching the post-hoc cleanup of _write_generated_file:
+        markdown fence lines are dropped (in case the LLM disobeyed), leading and
+        trailing whitespace/backticks are trimmed, and blank lines are held back until
+        more content follows so the file never ends in trailing whitespace.
+        """
+        written = False
+        held_blank: list = []
+        
+        with open(filepath, "w", encoding="utf-8") as f:
+            def emit(line: str):
+                nonlocal written
+                if _FENCE_LINE_RE.fullmatch(line.strip()):
+                    return
+                if not line.strip():
+                    if written:
+                        held_blank.append(line)
+                    return
+                if written:
+                    f.write("\n" + "".join(blank + "\n" for blank in held_blank) + line)
+                else:
+                    f.write(line.lstrip().lstrip("`"))
+                    written = True
+                held_blank.clear()
+            
+            partial = ""
+            for raw in response.iter_lines():
+                if not raw:
+                    continue
+                chunk = json.loads(raw)
+                partial += chunk.get("response", "")
+                *lines, partial = partial.split("\n")
+                for line in lines:
+                    emit(line)
+                if chunk.get("done"):
+                    break
+            
+            emit(partial.rstrip().rstrip("`"))
+
     def _generate_and_write_file(self, reqs: str, filepath: str, instruction: str):
         """Uses local LLM to generate the actual code and writes it to disk."""
         print(f"[DevAgent] Generating code for nearest file: {filepath}...")
         prompt = f"{instruction}\\n\\nRequirements: {reqs}\\n\\nEnsure your response contains NO formatting blocks like ```html, ONLY the raw text that goes straight into the file."
         
         try:
-            response = requests.post(f"{OLLAMA_URL}/generate", json={
+            # Streamed: the file fills in as tokens arrive, and the timeout bounds the gap
+            # between chunks rather than the whole generation
+            with self.http_session.post(f"{OLLAMA_URL}/generate", json={
                 "model": RESPONDER_MODEL,
                 "prompt": prompt,
-                "stream": False
-            }, timeout=60)
-            
-            if response.status_code == 200:
-                code_content = response.json().get("response", "").strip()
-                # Clean up potential markdown blocks if LLM disobeyed
-                code_content = re.sub(r"^```[a-zA-Z]*\\n", "", code_content, flags=re.MULTILINE)
-                code_content = re.sub(r"\\n```$", "", code_content, flags=re.MULTILINE)
-                code_content = code_content.strip("`")
-                
-                with open(filepath, "w", encoding="utf-8") as f:
-                    f.write(code_content)
-                print(f"[DevAgent] ✓ Wrote {filepath}")
+                "stream": True
+            }, stream=True, timeout=60) as response:
+                if response.status_code == 200:
+                    self._stream_generation_to_file(response, filepath)
+                    print(f"[DevAgent] ✓ Wrote {filepath}")
         except Exception as e:
             print(f"[DevAgent] Code generation failed for {filepath}: {e}")
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(f"// Failed to generate code: {e}")
+            Path(filepath).write_text(f"// Failed to generate code: {e}", encoding="utf-8")
 
 # Global instance
 dev_agent = DevAgent()
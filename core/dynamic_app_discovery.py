@@ -4,9 +4,12 @@ No hardcoded paths - uses visual analysis to find and launch any application.
 """
 
 import os
+import re
 import time
+import threading
 import subprocess
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 try:
@@ -23,6 +26,11 @@ except ImportError as e:
     win32con = None
     winreg = None
 
+# Extensions and installer/config noise stripped from file names in one pass,
+# instead of one str.replace scan per token for every file the scan finds
+_APP_NAME_NOISE_RE = re.compile(r"\.exe|\.lnk|uninstall|setup|config")
+
+
 class DynamicAppDiscovery:
     """Intelligent app discovery that works with ANY installed application."""
     
@@ -46,9 +54,7 @@ class DynamicAppDiscovery:
             os.path.expanduser("~\\Desktop")
         ]
         
-        for path in common_paths:
-            if os.path.exists(path):
-                apps.update(self._scan_directory(path))
+        apps.update(self._scan_directories([path for path in common_paths if os.path.exists(path)]))
         
         # Method 2: Check Windows Registry for installed programs
         apps.update(self._scan_registry())
@@ -62,17 +68,70 @@ class DynamicAppDiscovery:
     
     def _scan_directory(self, directory: str) -> Dict[str, str]:
         """Scan directory for executable files."""
-        apps = {}
+        return self._scan_directories([directory])
+    
+    def _scan_directories(self, roots: List[str]) -> Dict[str, str]:
+        """Scan several directory trees for executables in parallel.
+
+        Every directory is one os.scandir call on a worker thread (the DirEntry already
+        knows whether it is a directory), and its subdirectories are queued back onto
+        the pool. Each worker collects its finds in its own per-root dicts, so only the
+        subdirectory lists pass back through this thread; the dicts are merged once at
+        the end in root order, so later roots win name clashes. Within one root a clash
+        goes to the path that sorts last, whichever thread found it, so results repeat
+        from scan to scan.
+        """
+        if not roots:
+            return {}
+        local = threading.local()
+        per_worker: List[List[Dict[str, str]]] = []
+        register_lock = threading.Lock()
+        
+        def _scan(index: int, directory: str) -> Tuple[int, List[str]]:
+            found_by_root = getattr(local, "found_by_root", None)
+            if found_by_root is None:
+                found_by_root = local.found_by_root = [{} for _ in roots]
+                with register_lock:
+                    per_worker.append(found_by_root)
+            return index, self._scan_one_directory(directory, found_by_root[index])
+        
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 4) * 4)) as pool:
+            pending = {pool.submit(_scan, index, root) for index, root in enumerate(roots)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, subdirs = future.result()
+                    pending.update(pool.submit(_scan, index, subdir) for subdir in subdirs)
+        
+        apps: Dict[str, str] = {}
+        for index in range(len(roots)):
+            root_apps: Dict[str, str] = {}
+            for found_by_root in per_worker:
+                for name, path in found_by_root[index].items():
+                    if path > root_apps.get(name, ""):
+                        root_apps[name] = path
+            apps.update(root_apps)
+        return apps
+    
+    def _scan_one_directory(self, directory: str, found: Dict[str, str]) -> List[str]:
+        """List one directory: record executables into `found`, return subdirectories still to scan."""
+        subdirs: List[str] = []
         try:
-            for root, dirs, files in os.walk(directory):
-                for file in files:
-                    if file.endswith(('.exe', '.lnk')):
-                        file_path = os.path.join(root, file)
-                        app_name = self._extract_app_name(file)
-                        apps[app_name.lower()] = file_path
-        except PermissionError:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name.endswith(('.exe', '.lnk')):
+                            name = self._extract_app_name(entry.name).lower()
+                            if entry.path > found.get(name, ""):
+                                found[name] = entry.path
+                    except OSError:
+                        continue
+        except OSError:
             pass  # Skip directories we can't access
-        return apps
+        subdirs.sort()
+        return subdirs
     
     def _scan_registry(self) -> Dict[str, str]:
         """Scan Windows Registry for installed programs."""
@@ -113,9 +172,7 @@ class DynamicAppDiscovery:
             r"C:\ProgramData\Microsoft\Windows\Start Menu\\Programs"
         ]
         
-        for path in start_menu_paths:
-            if os.path.exists(path):
-                apps.update(self._scan_directory(path))
+        apps.update(self._scan_directories([path for path in start_menu_paths if os.path.exists(path)]))
         
         return apps
     
@@ -131,10 +188,8 @@ class DynamicAppDiscovery:
     
     def _extract_app_name(self, filename: str) -> str:
         """Extract clean app name from filename."""
-        name = filename.replace('.exe', '').replace('.lnk', '')
-        # Remove common prefixes/suffixes
-        name = name.replace('uninstall', '').replace('setup', '').replace('config', '')
-        return name.strip()
+        # Remove the extension and common prefixes/suffixes
+        return _APP_NAME_NOISE_RE.sub('', filename).strip()
     
     def find_app_by_name(self, app_name: str) -> Optional[str]:
         """Find app using intelligent matching."""
@@ -29,6 +29,104 @@ from utilities.spotify_handler import SpotifyHandler
 from utilities.research_handler import research_handler  
 from utilities.search_handler import web_search_handler  
 
+_TASK_ID_FMT = "task_%Y%m%d_%H%M%S"
+
+
+def _iter_files_with_suffix(root: str, suffixes):
+    """Yield paths of files under `root` whose lowercased extension is in `suffixes`.
+
+    Walks with os.scandir: file/dir type comes from the directory listing itself, so
+    only the matching names cost anything beyond the listing (no stat per entry as
+    with rglob + is_file). Unreadable directories are skipped, not fatal. Symlinked
+    directories are not followed.
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in suffixes and entry.is_file():
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+# App names that mark a prompt as an app command. Compiled into one alternation (longest
+# names first) so a prompt is scanned once instead of once per app name.
+_APP_KEYWORDS = (
+    "chrome", "firefox", "edge", "safari", "visual studio", "vs code",
+    "visualstudio", "notepad", "word", "excel", "powerpoint",
+    "spotify", "vlc", "telegram", "discord", "slack"
+)
+_CAPABILITY_KEYWORDS = (
+    "tell me about yourself", "what can you do", "who are you", "what are you",
+    "your capabilities", "what do you do", "help", "abilities", "features",
+    "what are your features", "introduction", "introduce yourself"
+)
+_UI_TERMS = ("select", "choose", "profile", "search", "find", "click", "type", "navigate", "scroll", "wait")
+
+def _keyword_pattern(keywords) -> "re.Pattern[str]":
+    """Compile substring keywords into one alternation, longest first, scanned in a single pass."""
+    return re.compile("|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)))
+
+# Actionable computer-task detection (substring semantics, same as the old any() checks)
+_ACTION_VERB_RE = _keyword_pattern((
+    "open", "launch", "start", "run", "create", "make", "delete", "remove",
+    "rename", "move", "copy", "write", "save", "install", "uninstall"
+))
+_COMPUTER_OBJECT_RE = _keyword_pattern((
+    "file", "folder", "directory", "desktop", "downloads", "documents", "vscode",
+    "vs code", "visual studio code", "terminal", "powershell", "cmd", ".html", ".py", ".txt"
+))
+_EXECUTION_MARKER_RE = _keyword_pattern(("then", "after that", "step", "and then", "on my pc", "on my computer"))
+
+_LAUNCH_INTENT_RE = re.compile(r"(open|launch|start|run)\s+(\w+)")
+_APP_KEYWORD_RE = _keyword_pattern(_APP_KEYWORDS)
+
+# The kernel truncates /proc/<pid>/comm to 15 characters (TASK_COMM_LEN - 1)
+_PROC_COMM_LEN = 15
+
+def _is_process_running(names) -> bool:
+    """True if a process whose (lowercased) name is in `names` is running.
+
+    On Linux this reads /proc/<pid>/comm directly, one small read per process,
+    instead of building a psutil.Process per PID. Elsewhere it uses psutil.
+    """
+    if os.path.isdir("/proc/self"):
+        # Longer names can only be matched on the prefix comm keeps
+        comm_names = {name[:_PROC_COMM_LEN] for name in names}
+        with os.scandir("/proc") as entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    fd = os.open(f"/proc/{entry.name}/comm", os.O_RDONLY)
+                except OSError:
+                    continue  # Process exited or is not ours to inspect
+                try:
+                    comm = os.read(fd, 64)
+                except OSError:
+                    continue
+                finally:
+                    os.close(fd)
+                if comm.rstrip(b"\n").decode("utf-8", "replace").lower() in comm_names:
+                    return True
+        return False
+
+    for proc in psutil.process_iter(["name"]):
+        if (proc.info.get("name") or "").lower() in names:
+            return True
+    return False
+
+_SPOTIFY_PROCESS_NAMES = frozenset(("spotify.exe", "spotify"))
+
+# Word separators in song file names, swapped for spaces in one C-level pass
+_TITLE_SEPARATORS = str.maketrans("_-", "  ")
+
 class FunctionExecutor:
     """Central executor for simplified core functions."""
     
@@ -118,24 +216,18 @@ class FunctionExecutor:
         id_map: Dict[str, str] = {}
 
         for root in search_roots:
-            if not root.exists() or not root.is_dir():
-                continue
-            try:
-                for file in root.rglob("*"):
-                    if not file.is_file() or file.suffix.lower() not in exts:
-                        continue
-                    sid = hashlib.sha1(str(file).encode("utf-8")).hexdigest()[:16] 
-                    title = file.stem.replace("_", " ").replace("-", " ").strip()
-                    rec = {
-                        "id": sid,
-                        "title": title,
-                        "artist": file.parent.name,
-                        "path": str(file),
-                    }
-                    catalog.append(rec)
-                    id_map[sid] = str(file)
-            except Exception:
-                continue
+            for file in _iter_files_with_suffix(str(root), exts):
+                sid = hashlib.sha1(file.encode("utf-8")).hexdigest()[:16] 
+                stem = os.path.splitext(os.path.basename(file))[0]
+                title = stem.translate(_TITLE_SEPARATORS).strip()
+                rec = {
+                    "id": sid,
+                    "title": title,
+                    "artist": os.path.basename(os.path.dirname(file)),
+                    "path": file,
+                }
+                catalog.append(rec)
+                id_map[sid] = file
 
         self._local_song_catalog = catalog
         self._local_song_map = id_map
@@ -212,11 +304,7 @@ class FunctionExecutor:
 
         try:
             if not spotify_running:
-                for proc in psutil.process_iter(["name"]):
-                    name = (proc.info.get("name") or "").lower()
-                    if name == "spotify.exe" or name == "spotify":
-                        spotify_running = True
-                        break
+                spotify_running = _is_process_running(_SPOTIFY_PROCESS_NAMES)
         except Exception:
             if not spotify_running:
                 spotify_running = False
@@ -320,52 +408,29 @@ class FunctionExecutor:
     
     def _is_capability_question(self, prompt: str) -> bool:
         """Check if the prompt is asking about capabilities."""
-        capability_keywords = [
-            "tell me about yourself", "what can you do", "who are you", "what are you",
-            "your capabilities", "what do you do", "help", "abilities", "features",
-            "what are your features", "introduction", "introduce yourself"
-        ]
-        
         prompt_lower = prompt.lower()
-        return any(keyword in prompt_lower for keyword in capability_keywords)
+        return any(keyword in prompt_lower for keyword in _CAPABILITY_KEYWORDS)
     
     def _is_app_opening_command(self, prompt: str) -> bool:
         """Check if prompt is trying to open an app but was misrouted."""
         # More aggressive detection for app opening commands
         prompt_lower = prompt.lower()
         
-        # Direct app opening patterns
-        open_patterns = [
-            r"open\s+(\w+)",
-            r"launch\s+(\w+)", 
-            r"start\s+(\w+)",
-            r"run\s+(\w+)"
-        ]
-        
-        # Check for direct patterns first
-        for pattern in open_patterns:
-            if re.search(pattern, prompt_lower):
-                print(f"[FunctionExecutor] Found app opening pattern: {pattern}")
-                return True
-        
-        # Check for UI-related terms that indicate complex commands
-        ui_terms = ["select", "choose", "profile", "search", "find", "click", "type", "navigate", "scroll", "wait"]
+        # Check for direct "open/launch/start/run <app>" patterns first
+        launch_match = _LAUNCH_INTENT_RE.search(prompt_lower)
+        if launch_match:
+            print(f"[FunctionExecutor] Found app opening pattern: {launch_match.group(1)} {launch_match.group(2)}")
+            return True
         
-        # If any UI term is found, it's likely a complex command
-        if any(term in prompt_lower for term in ui_terms):
+        # If any UI-related term is found, it's likely a complex command
+        if any(term in prompt_lower for term in _UI_TERMS):
             print(f"[FunctionExecutor] Detected UI-related command: '{prompt}'")
             return True
         
-        # Check for app names in the prompt
-        app_keywords = [
-            "chrome", "firefox", "edge", "safari", "visual studio", "vs code", 
-            "visualstudio", "notepad", "word", "excel", "powerpoint", 
-            "spotify", "vlc", "telegram", "discord", "slack"
-        ]
-        
         # If any app name is mentioned, treat as app command
-        if any(app in prompt_lower for app in app_keywords):
-            print(f"[FunctionExecutor] Found app keyword in: '{prompt}'")
+        app_match = _APP_KEYWORD_RE.search(prompt_lower)
+        if app_match:
+            print(f"[FunctionExecutor] Found app keyword '{app_match.group(0)}' in: '{prompt}'")
             return True
             
         return False
@@ -452,21 +517,10 @@ Say "stop" or "quit" at any time to interrupt me."""
 
         text = prompt.lower()
 
-        action_verbs = [
-            "open", "launch", "start", "run", "create", "make", "delete", "remove",
-            "rename", "move", "copy", "write", "save", "install", "uninstall"
-        ]
-        computer_objects = [
-            "file", "folder", "directory", "desktop", "downloads", "documents", "vscode",
-            "vs code", "visual studio code", "terminal", "powershell", "cmd", ".html", ".py", ".txt"
-        ]
-        execution_markers = ["then", "after that", "step", "and then", "on my pc", "on my computer"]
-
-        has_action = any(v in text for v in action_verbs)
-        has_object = any(o in text for o in computer_objects)
-        has_exec_marker = any(m in text for m in execution_markers)
-
-        return (has_action and has_object) or (has_action and has_exec_marker)
+        # Cheapest rejection first: without an action verb nothing else matters
+        if not _ACTION_VERB_RE.search(text):
+            return False
+        return bool(_COMPUTER_OBJECT_RE.search(text) or _EXECUTION_MARKER_RE.search(text))
 
     def _pc_control(self, params: Dict):
         """Handle system level commands."""
@@ -550,8 +604,9 @@ Say "stop" or "quit" at any time to interrupt me."""
         # 3. Check patterns
         patterns = memory_manager.get_learned_patterns()
         relevant_patterns = []
+        query_lower = query.lower()
         for name, data in patterns.items():
-            if query.lower() in name.lower() or query.lower() in str(data).lower():
+            if query_lower in name.lower() or query_lower in str(data).lower():
                 relevant_patterns.append({"name": name, "data": data})
                 
         message = f"Memory recall for '{query}':\n"
@@ -751,8 +806,10 @@ Say "stop" or "quit" at any time to interrupt me."""
         """Handle website scaffolding."""
         prompt = params.get("prompt", "")
         framework = params.get("framework", "html")
+        # Skip cached generations, e.g. when the user asks for a fresh take
+        regenerate = bool(params.get("regenerate", False))
         
-        return dev_agent.scaffold_project(prompt, framework)
+        return dev_agent.scaffold_project(prompt, framework, regenerate=regenerate)
 
     def _set_call_directive(self, params: Dict):
         """Handle expecting an incoming call."""
@@ -809,13 +866,15 @@ Say "stop" or "quit" at any time to interrupt me."""
         title = params.get("title", "Untitled Task")
         description = params.get("description", "")
         
+        now = datetime.now()
+        created_at = now.isoformat()
         task = {
-            "id": f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            "id": now.strftime(_TASK_ID_FMT),
             "title": title,
             "description": description,
             "status": "pending",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
+            "created_at": created_at,
+            "updated_at": created_at
         }
         
         self.tasks.append(task)
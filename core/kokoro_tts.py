@@ -22,6 +22,8 @@ class KokoroTTS:
     def __init__(self, model_path: str = "models/kokoro/kokoro-v0_19.pth"):
         self.model_path = model_path
         self.pipeline = None
+        # One pipeline per language code; they all share the first pipeline's model
+        self._pipelines: Dict[str, Any] = {}
         self.is_initialized = False
         self.speech_queue = queue.Queue()
         self.stop_event = threading.Event()
@@ -40,7 +42,7 @@ class KokoroTTS:
             print(f"[KokoroTTS] Initializing Kokoro from {self.model_path}...")
             # Note: Kokoro requires 'onnxruntime' or 'torch'
             # This is a simplified initialization assuming the user has the model
-            self.pipeline = KPipeline(lang_code='a') # 'a' for American English
+            self.pipeline = self._get_pipeline('a') # 'a' for American English
             self.is_initialized = True
             
             # Start worker thread
@@ -52,6 +54,19 @@ class KokoroTTS:
             print(f"[KokoroTTS] Initialization failed: {e}")
             return False
 
+    def _get_pipeline(self, lang_code: str):
+        """Return the cached pipeline for a language, building it on first use."""
+        pipeline = self._pipelines.get(lang_code)
+        if pipeline is None:
+            if self._pipelines:
+                # Reuse the loaded KModel instead of loading the weights again
+                shared_model = next(iter(self._pipelines.values())).model
+                pipeline = KPipeline(lang_code=lang_code, model=shared_model)
+            else:
+                pipeline = KPipeline(lang_code=lang_code)
+            self._pipelines[lang_code] = pipeline
+        return pipeline
+
     def speak(self, text: str):
         """Queue text for speech."""
         if not self.is_initialized:
@@ -78,10 +93,10 @@ class KokoroTTS:
         target_lang = 'b' if v.startswith('b') else 'a'
         if self.pipeline and self.pipeline.lang_code != target_lang:
             print(f"[KokoroTTS] Switching language to {target_lang}")
-            self.pipeline = KPipeline(lang_code=target_lang)
+            self.pipeline = self._get_pipeline(target_lang)
             
         s = settings.get("tts.speed", 1.0)
-        self.speech_queue.put({"text": text, "voice": v, "speed": s})
+        self.speech_queue.put({"text": text, "voice": v, "speed": s, "pipeline": self.pipeline})
 
     def wait_for_completion(self):
         """Wait for queue to clear."""
@@ -95,13 +110,15 @@ class KokoroTTS:
                 self.speech_queue.get_nowait()
             except queue.Empty:
                 break
+            self.speech_queue.task_done()
         self.stop_event.clear()
 
     def _worker(self):
         """Process speech requests in the background."""
         while True:
             try:
-                item = self.speech_queue.get(timeout=1)
+                # Block until work arrives instead of waking every second to poll
+                item = self.speech_queue.get()
                 text = item["text"]
                 voice = item.get("voice", "af_heart")
                 speed = item.get("speed", 1.0)
@@ -109,20 +126,19 @@ class KokoroTTS:
                 print(f"[KokoroTTS] Generating: {text[:50]}...") 
                 
                 # Kokoro generation
-                generator = self.pipeline(text, voice=voice, speed=speed) 
+                pipeline = item.get("pipeline") or self.pipeline
+                generator = pipeline(text, voice=voice, speed=speed) 
                 
-                for gs, ps, audio in generator:
-                    if self.stop_event.is_set():
-                        break
-                    
-                    # Play audio using sounddevice
-                    sd.play(audio, 24000) # Kokoro uses 24kHz
-                    sd.wait()
+                # One stream per request: each generated chunk is written straight
+                # to it instead of opening a new stream per chunk with sd.play/sd.wait
+                with sd.OutputStream(samplerate=24000, channels=1, dtype='float32') as stream: # Kokoro uses 24kHz
+                    for gs, ps, audio in generator:
+                        if self.stop_event.is_set():
+                            break
+                        stream.write(np.asarray(audio, dtype=np.float32).reshape(-1, 1))
                 
                 self.speech_queue.task_done()
                     
-            except queue.Empty:
-                continue
             except Exception as e:
                 print(f"[KokoroTTS] Worker error: {e}")
                 time.sleep(1)
@@ -4,11 +4,21 @@ Enables the AI to retain information across interactions and learn from past exp
 """
 
 import json
+import mmap
 import os
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from config import GRAY, RESET, CYAN, GREEN, YELLOW
 
+try:
+    # The memory files are rewritten whole on every log call; json.dump with indent falls back
+    # to the pure-Python encoder, orjson encodes (and parses) them in C
+    import orjson
+except ImportError:
+    orjson = None
+_json_loads = orjson.loads if orjson else json.loads  # Both take UTF-8 bytes
+
 # Memory storage path
 MEMORY_DIR = "data/memory"
 REASONING_LOG = os.path.join(MEMORY_DIR, "reasoning_log.json")
@@ -16,6 +26,86 @@ INTERACTION_HISTORY = os.path.join(MEMORY_DIR, "interaction_history.json")
 LEARNED_PATTERNS = os.path.join(MEMORY_DIR, "learned_patterns.json")
 USER_PREFERENCES = os.path.join(MEMORY_DIR, "user_preferences.json")
 
+# Below this size a plain read is cheaper than setting up a mapping
+MMAP_MIN_SIZE = 64 * 1024
+
+# ASCII lowercase table for bytes.translate (case-folds raw file data without decoding it)
+_LC_TABLE = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", b"abcdefghijklmnopqrstuvwxyz")
+SCAN_CHUNK_SIZE = 1024 * 1024
+
+# Directory sizes need a stat per file and barely move between stats requests
+DIR_SIZE_TTL = 30.0
+_dir_size_cache: Dict[str, Tuple[float, str]] = {}
+
+
+def _contains_casefold(buf, *needles_lc: bytes) -> bool:
+    """ASCII case-insensitive search of bytes or an mmap for any of some lowercased needles.
+
+    Each chunk is lowercased once with bytes.translate and searched with find (both C
+    loops); chunks overlap by the longest needle - 1 so a match straddling a boundary
+    is still seen.
+    """
+    if not needles_lc:
+        return False
+    overlap = max(len(n) for n in needles_lc) - 1
+    for start in range(0, len(buf), SCAN_CHUNK_SIZE):
+        chunk = buf[start:start + SCAN_CHUNK_SIZE + overlap].translate(_LC_TABLE)
+        if any(chunk.find(needle) != -1 for needle in needles_lc):
+            return True
+    return False
+
+
+def _json_tail_from(buf, needle: bytes) -> Optional[list]:
+    """Parse an indent=2 JSON list from the entry holding the first `needle` to the end.
+
+    Only the tail is decoded. Returns [] if `needle` doesn't occur, None if the file isn't
+    laid out as expected (the caller should decode the whole file instead).
+    """
+    pos = buf.find(needle)
+    if pos == -1:
+        return []
+    # Top-level entries are the only lines starting with exactly two spaces and a brace
+    # (nested values are indented deeper, and strings can't hold a raw newline)
+    start = buf.rfind(b"\n  {", 0, pos)
+    if start == -1:
+        return None
+    try:
+        return _json_loads(b"[" + buf[start:])
+    except ValueError:
+        return None
+
+
+def _dir_size_bytes(root: str) -> int:
+    """Total size of the files under `root`.
+
+    Walks a stack of os.scandir iterators instead of os.walk + os.path.getsize: entry
+    types come from the directory listing and, on Windows, sizes do too, so there is no
+    per-file path join and stat by name. Directory symlinks are not followed (as os.walk).
+    """
+    total = 0
+    try:
+        stack = [os.scandir(root)]
+    except FileNotFoundError:
+        return 0  # Not created yet (fresh install): empty, as os.walk reported it
+    try:
+        while stack:
+            try:
+                entry = next(stack[-1])
+            except StopIteration:
+                stack.pop().close()
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(os.scandir(entry.path))
+                elif entry.is_file():
+                    total += entry.stat().st_size
+            except OSError:
+                continue  # Unreadable or vanished entry; os.walk skips these too
+    finally:
+        for it in stack:
+            it.close()
+    return total
+
 
 class MemoryManager:
     """Manages persistent memory storage and retrieval."""
@@ -74,10 +164,18 @@ class MemoryManager:
     def get_similar_reasoning(self, query: str, limit: int = 3) -> List[Dict[str, Any]]:
         """Retrieve similar past reasoning for reference."""
         try:
-            log_data = self._load_json_file(REASONING_LOG, default=[])
-            
             # Simple keyword matching for similarity
             query_words = set(query.lower().split())
+            
+            # A match needs at least one shared word, so if no query word occurs anywhere in the
+            # raw log the log can't match: skip decoding it. Words that aren't stored verbatim
+            # (non-ASCII, possibly \u-escaped) can't be ruled out this way.
+            if all(word.isascii() for word in query_words):
+                needles = [json.dumps(word)[1:-1].encode() for word in query_words]
+                if not self._scan_file(REASONING_LOG, lambda buf: _contains_casefold(buf, *needles)):
+                    return []
+            
+            log_data = self._load_json_file(REASONING_LOG, default=[])
             scored_entries = []
             
             for entry in log_data:
@@ -129,7 +227,15 @@ class MemoryManager:
     def get_conversation_context(self, limit: int = 5) -> List[Dict[str, str]]:
         """Get recent conversation history for context."""
         try:
-            history_data = self._load_json_file(INTERACTION_HISTORY, default=[])
+            # Entries are appended in order, so this session's all follow the first mention of
+            # its id: find that with one memory-mapped search and decode only the tail. Nothing
+            # logged this session yet means nothing is decoded at all.
+            needle = json.dumps(self.current_session_id).encode()
+            history_data = self._scan_file(INTERACTION_HISTORY, lambda buf: _json_tail_from(buf, needle))
+            if history_data is False:
+                return []  # No history file yet
+            if history_data is None:
+                history_data = self._load_json_file(INTERACTION_HISTORY, default=[])
             
             # Filter by current session
             session_interactions = [
@@ -275,18 +381,37 @@ class MemoryManager:
         """Load JSON file safely."""
         try:
             if os.path.exists(filepath):
-                with open(filepath, 'r') as f:
-                    return json.load(f)
+                with open(filepath, 'rb') as f:
+                    data = f.read()
+                return _json_loads(data)
         except Exception as e:
             print(f"{GRAY}[Memory] Error loading {filepath}: {e}{RESET}")
         
         return default if default is not None else {}
     
+    def _scan_file(self, filepath: str, search) -> Any:
+        """Run `search` over a file's raw bytes, memory-mapped when large; returns its result, False if unreadable."""
+        try:
+            with open(filepath, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < MMAP_MIN_SIZE:
+                    return search(f.read())
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    return search(mm)
+        except OSError:
+            return False
+    
     def _save_json_file(self, filepath: str, data: Any) -> bool:
         """Save JSON file safely."""
         try:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2)
+            if orjson:
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(filepath, 'w') as f:
+                    json.dump(data, f, indent=2)
             return True
         except Exception as e:
             print(f"{GRAY}[Memory] Error saving {filepath}: {e}{RESET}")
@@ -325,16 +450,26 @@ class MemoryManager:
             return {}
     
     def _get_dir_size(self, path: str) -> str:
-        """Get directory size in human-readable format."""
+        """Get directory size in human-readable format (cached for DIR_SIZE_TTL seconds)."""
+        now = time.monotonic()
+        cached = _dir_size_cache.get(path)
+        if cached and now - cached[0] < DIR_SIZE_TTL:
+            return cached[1]
+        
         try:
-            total = sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(path) for f in files)
+            total = _dir_size_bytes(path)
             for unit in ['B', 'KB', 'MB']:
                 if total < 1024:
-                    return f"{total:.1f} {unit}"
+                    size = f"{total:.1f} {unit}"
+                    break
                 total /= 1024
-            return f"{total:.1f} GB"
+            else:
+                size = f"{total:.1f} GB"
         except:
             return "Unknown"
+        
+        _dir_size_cache[path] = (now, size)
+        return size
     
     def export_memory(self, export_path: str) -> bool:
         """Export all memory data to a file."""
@@ -4,13 +4,20 @@ Model Manager - Utilities for loading/unloading Ollama models.
 
 import requests  
 import threading
+import time
 from config import OLLAMA_URL, GRAY, RESET  
 
+# /api/ps answers are reused briefly: status checks and load/exclusion logic often ask
+# several times in a row, and the loaded set only changes on a load or unload
+RUNNING_MODELS_TTL = 1.0
+_running_models_cache = (0.0, None)  # (time.monotonic() of the fetch, model names)
+
 
 def sync_unload_model(model_name: str):
     """
     Synchronously unload a model from Ollama.
     """
+    global _running_models_cache
     try:
         # Send a request with keep_alive=0 to unload
         response = requests.post(
@@ -28,6 +35,8 @@ def sync_unload_model(model_name: str):
             print(f"{GRAY}[ModelManager] Failed to unload {model_name}: {response.status_code}{RESET}")
     except Exception as e:
         print(f"{GRAY}[ModelManager] Error unloading {model_name}: {e}{RESET}")
+    finally:
+        _running_models_cache = (0.0, None)
 
 
 def unload_model(model_name: str):
@@ -57,13 +66,20 @@ def unload_all_models(sync: bool = False):
         print(f"{GRAY}[ModelManager] Error getting running models: {e}{RESET}")
 
 
-def get_running_models() -> list:
-    """Get list of currently running model names."""
+def get_running_models(force: bool = False) -> list:
+    """Get list of currently running model names (cached for RUNNING_MODELS_TTL unless force)."""
+    global _running_models_cache
+    now = time.monotonic()
+    fetched_at, names = _running_models_cache
+    if not force and names is not None and now - fetched_at < RUNNING_MODELS_TTL:
+        return list(names)
     try:
         response = requests.get(f"{OLLAMA_URL}/ps", timeout=2)
         if response.status_code == 200:
             data = response.json()
-            return [m.get("name", "") for m in data.get("models", [])]
+            names = [m.get("name", "") for m in data.get("models", [])]
+            _running_models_cache = (now, names)
+            return list(names)
     except:
         pass
     return []
@@ -5,6 +5,7 @@ Routes queries to specialized models based on complexity and task type.
 
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Tuple, Optional
 from config import OLLAMA_URL, GRAY, RESET, CYAN, GREEN, YELLOW
 from config import RESPONDER_MODEL
@@ -269,9 +270,9 @@ Provide detailed analysis considering multiple dimensions and implications."""
         """
         print(f"{CYAN}[MultiModel] Getting responses from multiple models for comparison...{RESET}")
         
-        responses = {}
+        model_keys = ["fast", "balanced", "deep"]
         
-        for model_key in ["fast", "balanced", "deep"]:
+        def _ask(model_key: str) -> Optional[Dict[str, str]]:
             model_name = self.MODELS[model_key]["name"]
             
             try:
@@ -287,13 +288,21 @@ Provide detailed analysis considering multiple dimensions and implications."""
                 )
                 
                 if response.status_code == 200:
-                    responses[model_key] = {
+                    return {
                         "model": model_name,
                         "response": response.json().get("response", "")[:300]  # Truncate
                     }
             
             except Exception as e:
                 print(f"{GRAY}[MultiModel] Failed to get response from {model_name}: {e}{RESET}")
+            
+            return None
+        
+        # The models are queried independently, so the requests overlap instead of queueing
+        with ThreadPoolExecutor(max_workers=len(model_keys)) as pool:
+            results = list(pool.map(_ask, model_keys))
+        
+        responses = {key: result for key, result in zip(model_keys, results) if result}
         
         # Rank responses by length and coherence (simple heuristic)
         ranked = sorted(
@@ -6,8 +6,10 @@ import os
 import subprocess
 import time
 import shutil
+import sys
+import tempfile
 import threading
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 try:
     import pyautogui  
@@ -19,8 +21,34 @@ except Exception as e:
 from core.dynamic_app_discovery import dynamic_discovery  
 from core.omni_parser_client import omni_parser
 import base64
+import re
 from io import BytesIO
 
+# Conversational filler the STT wraps around app names ("could you open the spotify app for me")
+_LAUNCH_PREFIX_RE = re.compile(r'^(please\s+)?(could you\s+)?(can you\s+)?(open\s+)?(the\s+)?(app\s+)?(application\s+)?')
+_LAUNCH_SUFFIX_RE = re.compile(r'\s+(for me|please)\b')
+
+# Power actions as argv lists with absolute paths: run directly, no shell and no PATH lookup
+if os.name == "nt":
+    _SYSTEM32 = os.path.join(os.environ.get("SystemRoot", r"C:\Windows"), "System32")
+    _POWER_COMMANDS = {
+        "shutdown": [os.path.join(_SYSTEM32, "shutdown.exe"), "/s", "/t", "1"],
+        "restart": [os.path.join(_SYSTEM32, "shutdown.exe"), "/r", "/t", "1"],
+        "sleep": [os.path.join(_SYSTEM32, "rundll32.exe"), "powrprof.dll,SetSuspendState", "0,1,0"],
+    }
+elif sys.platform == "darwin":
+    _POWER_COMMANDS = {
+        "shutdown": ["/sbin/shutdown", "-h", "now"],
+        "restart": ["/sbin/shutdown", "-r", "now"],
+        "sleep": ["/usr/bin/pmset", "sleepnow"],
+    }
+else:
+    _POWER_COMMANDS = {
+        "shutdown": ["/sbin/shutdown", "-h", "now"],
+        "restart": ["/sbin/shutdown", "-r", "now"],
+        "sleep": [shutil.which("systemctl") or "/usr/bin/systemctl", "suspend"],
+    }
+
 class PCController:
     """Handles system level commands like controlling volume, opening apps, or locking the PC."""
     _global_lock = threading.Lock()
@@ -62,12 +90,78 @@ class PCController:
             "visual studio code": "code.exe",
             "discord": "Update.exe --processStart Discord.exe"
         }
+
+        self._is_macos = sys.platform == "darwin"
+
+        # Pick the platform's launcher once so cached launches don't re-branch on os.name
+        if os.name == "nt":
+            self._detach_kwargs: Dict[str, Any] = {"close_fds": True, "creationflags": subprocess.DETACHED_PROCESS}
+            self._start_path = self._start_path_windows
+        else:
+            self._detach_kwargs = {"close_fds": True, "start_new_session": True}
+            self._start_path = self._start_path_posix
+
+        # Resolve known executables to absolute paths once so launches skip the PATH walk
+        self._app_paths: Dict[str, str] = self._resolve_app_paths()
         
         if instance_no == 1:
             print("[PC Control] Initialized (app discovery will start on first app request)")
         else:
             print(f"[PC Control] Initialized (instance #{instance_no}, using shared discovery state)")
 
+    def _resolve_app_paths(self) -> Dict[str, str]:
+        """Map known app names to absolute executable paths (apps not on PATH are skipped)."""
+        resolved: Dict[str, str] = {}
+        for name, executable in self.app_map.items():
+            # URIs and commands with arguments can't be exec'd directly
+            if ":" in executable or " " in executable:
+                continue
+            path = shutil.which(executable)
+            if path:
+                resolved[name] = path
+        return resolved
+
+    def _launch_resolved_app(self, app_name: str) -> Optional[Dict[str, Any]]:
+        """Launch a known app from its cached absolute path without a shell."""
+        path = self._app_paths.get(app_name)
+        if not path:
+            return None
+        try:
+            self._start_path(path)
+            print(f"[PC Control] ✓ Launched {app_name} from cached path: {path}")
+            return {"success": True, "message": f"I have opened {app_name}."}
+        except OSError as e:
+            # Stale entry (app moved or uninstalled): forget it and take the slow path
+            self._app_paths.pop(app_name, None)
+            print(f"[PC Control] Cached launch failed for {app_name}: {e}")
+            return None
+
+    def _start_path_windows(self, path: str) -> None:
+        """Start a cached app path on Windows, detached from this process."""
+        if not path.lower().endswith(".exe"):
+            # Shortcuts (.lnk) remembered from discovery need the shell association
+            os.startfile(path)  
+        else:
+            subprocess.Popen([path], **self._detach_kwargs)
+
+    def _start_path_posix(self, path: str) -> None:
+        """Start a cached app path in its own session."""
+        subprocess.Popen([path], **self._detach_kwargs)
+
+    def _show_visual_feedback(self) -> None:
+        """Glide the cursor to screen center on a background thread as a 'working' cue."""
+        if not pyautogui:
+            return
+
+        def _glide():
+            try:
+                screen_width, screen_height = pyautogui.size()
+                pyautogui.moveTo(screen_width // 2, screen_height // 2, duration=0.5)
+            except Exception as e:
+                print(f"[PC Control] Visual feedback skipped: {e}")
+
+        threading.Thread(target=_glide, daemon=True).start()
+
     def _start_discovery_background(self):
         with self.__class__._global_lock:
             if self.__class__._global_discovered_apps:
@@ -171,7 +265,7 @@ class PCController:
             
             # Convert to base64
             buffered = BytesIO()
-            screenshot.save(buffered, format="PNG")
+            screenshot.save(buffered, format="PNG", compress_level=1)  # Transient payload, encode fast
             img_str = base64.b64encode(buffered.getvalue()).decode()
             
             # Parse via OmniParser
@@ -387,12 +481,16 @@ class PCController:
         app_name = app_name.replace("_", " ").strip().lower()
         
         # Strip common conversational prefixes/suffixes the STT might inject
-        import re
-        app_name = re.sub(r'^(please\s+)?(could you\s+)?(can you\s+)?(open\s+)?(the\s+)?(app\s+)?(application\s+)?', '', app_name).strip()
-        app_name = re.sub(r'\s+(for me|please)\b', '', app_name).strip()
+        app_name = _LAUNCH_PREFIX_RE.sub('', app_name).strip()
+        app_name = _LAUNCH_SUFFIX_RE.sub('', app_name).strip()
         
         print(f"[PC Control] Searching for app: '{app_name}'")
 
+        # Fast path: known app already resolved to an absolute path at startup
+        direct_result = self._launch_resolved_app(app_name)
+        if direct_result:
+            return direct_result
+
         # Method 0: PROFESSIONAL HUMAN-LIKE VISION FLOW (PRIORITY)
         print(f"[PC Control] Attempting professional human-like launch for: '{app_name}'")
         from core.vision_agent import vision_agent
@@ -430,14 +528,13 @@ class PCController:
                 print(f"[PC Control] Found app via dynamic discovery: {app_path}")
                 print(f"[PC Control] Launching: {app_path}")
                 
-                # Show visual feedback that we're working
-                if pyautogui:
-                    screen_width, screen_height = pyautogui.size()
-                    pyautogui.moveTo(screen_width // 2, screen_height // 2, duration=0.5)
-                    time.sleep(0.5)
+                # Show visual feedback that we're working (without delaying the launch)
+                self._show_visual_feedback()
                 
                 os.startfile(app_path)  
                 print(f"[PC Control] ✓ App launched successfully!")
+                # Remember the working target so the next request for this app launches directly
+                self._app_paths[app_name] = app_path
                 time.sleep(2)  # Wait for app to actually open
                 
                 return {"success": True, "message": f"I have opened {app_name} using dynamic discovery."}
@@ -528,24 +625,30 @@ class PCController:
             return {"success": False, "message": "pyautogui is missing."}
             
         target = target.replace("%", "").strip()
-        num_presses = 50 # max out or something generic
         
+        # Media keys are plain key events; skip pyautogui.PAUSE between them (the vision
+        # agent raises it to 1s, which turned a volume change into a ~75s key ramp).
         if target.isdigit():
+            target_vol = min(int(target), 100)
+            if self._is_macos:
+                # macOS can set the level directly in one call
+                subprocess.run(["osascript", "-e", f"set volume output volume {target_vol}"], check=True)
+                return {"success": True, "message": f"Set volume to {target}%."}
+            
             # A hacky volume control. Alternatively, you can use Pycaw.
             # Volume steps in Windows are 2 points per key press. We can just set it to 0 then up.
             for _ in range(50):
-                pyautogui.press("volumedown")
+                pyautogui.press("volumedown", _pause=False)
             
-            target_vol = int(target)
             presses = target_vol // 2
             for _ in range(presses):
-                pyautogui.press("volumeup")
+                pyautogui.press("volumeup", _pause=False)
             return {"success": True, "message": f"Set volume to {target}%."}
             
         elif target in ("up", "down"):
             action_key = "volumeup" if target == "up" else "volumedown"
             for _ in range(5): # move by 10%
-                pyautogui.press(action_key)
+                pyautogui.press(action_key, _pause=False)
             return {"success": True, "message": f"Turned volume {target}."}
             
         return {"success": False, "message": f"Invalid volume target: {target}"}
@@ -586,7 +689,7 @@ class PCController:
             if not self._request_confirmation("Shutdown PC"):
                 return {"success": False, "message": "Shutdown cancelled by user safety check."}
                 
-            os.system("shutdown /s /t 1")
+            subprocess.run(_POWER_COMMANDS["shutdown"], check=False)
             return {"success": True, "message": "Shutting down the PC."}
         except Exception as e:
             return {"success": False, "message": f"Could not shutdown PC: {e}"}
@@ -597,14 +700,14 @@ class PCController:
             if not self._request_confirmation("Restart PC"):
                 return {"success": False, "message": "Restart cancelled by user safety check."}
                 
-            os.system("shutdown /r /t 1")
+            subprocess.run(_POWER_COMMANDS["restart"], check=False)
             return {"success": True, "message": "Restarting the PC."}
         except Exception as e:
             return {"success": False, "message": f"Could not restart PC: {e}"}
 
     def _sleep_pc(self) -> Dict[str, Any]:
         try:
-            os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
+            subprocess.run(_POWER_COMMANDS["sleep"], check=False)
             return {"success": True, "message": "Put the PC to sleep."}
         except Exception as e:
             return {"success": False, "message": f"Could not sleep PC: {e}"}
@@ -633,12 +736,34 @@ class PCController:
         if not pyautogui:
             return {"success": False, "message": "pyautogui is missing."}
         try:
-            out_file = "screenshot.png"
-            pyautogui.screenshot(out_file)  
-            return {"success": True, "message": f"Saved screenshot to {os.path.abspath(out_file)}."}
+            out_file = os.path.abspath("screenshot.png")
+            image = pyautogui.screenshot()
         except Exception as e:
             return {"success": False, "message": f"Could not take screenshot: {e}"}
 
+        # Written before returning: the reply names the file, so it has to exist.
+        # Encode into a temp file beside the target and swap it in, so anything opening
+        # screenshot.png (or a second capture racing this one) never sees a half-written
+        # file. zlib level 1: several times faster than the default 6 on a full screen,
+        # for a slightly larger file.
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(suffix=".png", dir=os.path.dirname(out_file))
+            with os.fdopen(fd, "wb") as f:
+                image.save(f, format="PNG", compress_level=1)
+            os.replace(tmp_path, out_file)
+            tmp_path = None
+            return {"success": True, "message": f"Saved screenshot to {out_file}."}
+        except Exception as e:
+            print(f"[PC Control] Screenshot save failed: {e}")
+            return {"success": False, "message": f"Could not save screenshot: {e}"}
+        finally:
+            if tmp_path:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
     def _tile_windows_macos(self, layout: str = "dev") -> Dict[str, Any]:
         """Proportional window tiling for macOS using AppleScript."""
         print(f"[PC Control] Tiling windows for layout: {layout}")
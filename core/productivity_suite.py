@@ -113,8 +113,7 @@ class ProductivitySuite:
             
         content += f"\n## Full Transcript Reference\n\n{transcript}\n"
         
-        with open(file_path, "w") as f:
-            f.write(content)
+        file_path.write_text(content)
             
         return file_path
 
@@ -171,7 +170,9 @@ class ProductivitySuite:
                 end tell
             end tell
             '''
-            subprocess.run(['osascript', '-e', script])
+            # Nothing reads the result, so don't block the call flow while Calendar launches
+            subprocess.Popen(['osascript', '-e', script], start_new_session=True,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             
         except Exception as e:
             print(f"[Productivity] Failed to schedule callback: {e}")
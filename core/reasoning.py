@@ -262,28 +262,28 @@ Provide detailed validation feedback."""
     
     def _extract_next_steps(self, evaluation: str) -> List[str]:
         """Extract recommended next steps."""
-        lines = evaluation.split("\n")
-        next_steps = [l.strip() for l in lines if "step" in l.lower() or "should" in l.lower()]
+        lines = zip(evaluation.split("\n"), evaluation.lower().split("\n"))
+        next_steps = [l.strip() for l, low in lines if "step" in low or "should" in low]
         return next_steps[:3]
     
     def _extract_recommendation(self, reasoning: str) -> str:
         """Extract recommended action."""
-        lines = reasoning.split("\n")
-        for line in lines:
-            if "recommend" in line.lower() or "best" in line.lower():
+        lines = zip(reasoning.split("\n"), reasoning.lower().split("\n"))
+        for line, low in lines:
+            if "recommend" in low or "best" in low:
                 return line.strip()
         return "Reconsider the approach"
     
     def _extract_hidden_assumptions(self, reasoning: str) -> List[str]:
         """Extract hidden assumptions that were missed."""
-        lines = reasoning.split("\n")
-        assumptions = [l.strip() for l in lines if "assume" in l.lower() or "missed" in l.lower()]
+        lines = zip(reasoning.split("\n"), reasoning.lower().split("\n"))
+        assumptions = [l.strip() for l, low in lines if "assume" in low or "missed" in low]
         return assumptions[:3]
     
     def _extract_risks(self, reasoning: str) -> List[str]:
         """Extract risk assessment."""
-        lines = reasoning.split("\n")
-        risks = [l.strip() for l in lines if "risk" in l.lower() or "danger" in l.lower() or "fail" in l.lower()]
+        lines = zip(reasoning.split("\n"), reasoning.lower().split("\n"))
+        risks = [l.strip() for l, low in lines if "risk" in low or "danger" in low or "fail" in low]
         return risks[:3]
     
     def _extract_score(self, validation: str) -> int:
@@ -299,8 +299,8 @@ Provide detailed validation feedback."""
     
     def _extract_issues(self, validation: str) -> List[str]:
         """Extract validation issues."""
-        lines = validation.split("\n")
-        issues = [l.strip() for l in lines if "issue" in l.lower() or "problem" in l.lower() or "missing" in l.lower()]
+        lines = zip(validation.split("\n"), validation.lower().split("\n"))
+        issues = [l.strip() for l, low in lines if "issue" in low or "problem" in low or "missing" in low]
         return issues[:3]
     
     def get_reasoning_history(self) -> List[Dict[str, Any]]:
@@ -7,7 +7,7 @@ import json
 import time
 import datetime
 from config import OLLAMA_URL, RESPONDER_MODEL  
-from core.tts import tts  
+from core.tts import tts, SentenceBuffer  
 from core.database import db  
 from backend_api import sync_request_confirmation
 
@@ -70,12 +70,10 @@ class Receptionist:
             # Step 2: Generate greeting based on instructions
             prompt = f"You are Wolf AI, a phone assistant. You just answered a call from {matched_caller}. Your instructions from the boss are: {matched_instructions}. Keep your response to a single short sentence to start the conversation."
             
-            greeting = self._generate_response(prompt)
-            print(f"[Receptionist] Saying: {greeting}")
-            
-            # Step 3: Speak greeting via TTS
+            # Step 3: Speak greeting via TTS, sentence by sentence as it is generated
             tts.toggle(True)
-            tts.queue_sentence(greeting)
+            greeting = self._generate_response(prompt, speak=True)
+            print(f"[Receptionist] Saying: {greeting}")
             
             # Step 4: Real-Time Interaction Loop
             print("[Receptionist] Monitoring call audio...")
@@ -131,9 +129,8 @@ class Receptionist:
                 else:
                     # Generate autonomous LLM response
                     prompt = f"Caller said: '{caller_speech}'. Your instructions: {matched_instructions}. Respond naturally as Wolf AI."
-                    ai_reply = self._generate_response(prompt)
+                    ai_reply = self._generate_response(prompt, speak=True)
                     print(f"Wolf: {ai_reply}")
-                    tts.queue_sentence(ai_reply)
                     transcript_log += f"Wolf: {ai_reply}\n"
                     
                 # Check for hangup in next loop
@@ -176,22 +173,53 @@ class Receptionist:
             # Remove directive after processing
             del self.expected_calls[matched_caller]  
 
-    def _generate_response(self, prompt: str) -> str:
-        """Call Ollama locally to generate the dialogue."""
+    def _generate_response(self, prompt: str, speak: bool = False) -> str:
+        """
+        Call Ollama locally to generate the dialogue.
+
+        With speak=True the reply is streamed and each sentence is queued for TTS
+        as soon as it is complete, so the caller hears the first sentence while
+        the rest is still being generated.
+        """
+        spoken = []  # Sentences already queued for TTS
         try:
-            response = requests.post(f"{OLLAMA_URL}/generate", json={  
+            with requests.post(f"{OLLAMA_URL}/generate", json={  
                 "model": RESPONDER_MODEL,
                 "prompt": prompt,
-                "stream": False
-            }, timeout=30)
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("response", "").strip()
-            else:
-                return "Hello. My systems are currently offline."
+                "stream": speak
+            }, stream=speak, timeout=30) as response:
+                if response.status_code != 200:
+                    reply = "Hello. My systems are currently offline."
+                elif not speak:
+                    return response.json().get("response", "").strip()
+                else:
+                    sentence_buffer = SentenceBuffer()
+                    parts = []
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        chunk = json.loads(line)
+                        content = chunk.get("response", "")
+                        if content:
+                            parts.append(content)
+                            for sentence in sentence_buffer.add(content):
+                                tts.queue_sentence(sentence)
+                                spoken.append(sentence.strip())
+                        if chunk.get("done"):
+                            break
+                    rem = sentence_buffer.flush()
+                    if rem:
+                        tts.queue_sentence(rem)
+                    return "".join(parts).strip()
         except Exception as e:
             print(f"[Receptionist] LLM Error: {e}")
-            return "Hello. Let me note that down."
+            reply = "Hello. Let me note that down."
+        if spoken:
+            # The stream broke mid-reply: report what the caller actually heard
+            return " ".join(spoken)
+        if speak:
+            tts.queue_sentence(reply)
+        return reply
 
 # Singleton instance
 receptionist = Receptionist()
@@ -16,7 +16,7 @@ import os
 from typing import Optional, Callable, Any
 from config import (  
     WAKE_WORD, REALTIMESTT_MODEL, WAKE_WORD_SENSITIVITY,
-    CUSTOM_PPN_PATH, GRAY, RESET, CYAN, YELLOW, GREEN, RED
+    STT_STREAM_PARTIALS, STT_EARLY_TRANSCRIPTION_MS, CUSTOM_PPN_PATH, GRAY, RESET, CYAN, YELLOW, GREEN, RED
 )
 
 # ── Constants ────────────────────────────────────────────────────────────────
@@ -38,10 +38,13 @@ class STTListener:
     MODE_CONVERSATION = "conversation"
 
     def __init__(self, wake_word_callback: Callable, speech_callback: Callable,
-                 stop_callback: Optional[Callable] = None):
+                 stop_callback: Optional[Callable] = None,
+                 partial_callback: Optional[Callable[[str], None]] = None):
         self.wake_word_callback = wake_word_callback
         self.speech_callback    = speech_callback
         self.stop_callback      = stop_callback   # called when user says "stop"
+        self.partial_callback   = partial_callback  # called with in-progress hypotheses
+        self.partial_text       = ""
 
         self.running  = False
         self.recorder: Optional[Any] = None
@@ -101,6 +104,23 @@ class STTListener:
 
     # ── Initialization ────────────────────────────────────────────────────────
 
+    def _streaming_options(self) -> dict:
+        """
+        Recorder kwargs for on-device streaming transcription.
+
+        Partial hypotheses are decoded while the user is still speaking, reusing
+        the main Whisper model instead of loading a second one, and the final
+        pass starts early in the end-of-speech silence so it overlaps capture.
+        """
+        if not STT_STREAM_PARTIALS:
+            return {}
+        return {
+            "enable_realtime_transcription": True,
+            "use_main_model_for_realtime": True,
+            "on_realtime_transcription_update": self._on_partial_transcription,
+            "early_transcription_on_silence": STT_EARLY_TRANSCRIPTION_MS,
+        }
+
     def initialize(self) -> bool:
         """Initialize RealTimeSTT with wake word detection."""
         import os as _os
@@ -159,7 +179,8 @@ class STTListener:
                     language="en",
                     device="cuda" if cuda_available else "cpu",
                     spinner=False,
-                    use_microphone=True
+                    use_microphone=True,
+                    **self._streaming_options()
                 )
             except Exception as e:
                 print(f"{RED}[STT] ✗ Failed to initialize main recorder: {e}{RESET}")
@@ -186,6 +207,7 @@ class STTListener:
                 wakeword_backend="none",
                 wake_words="",
                 wake_words_sensitivity=WAKE_WORD_SENSITIVITY,
+                **self._streaming_options()
             )
 
             self.initialized = True
@@ -208,6 +230,20 @@ class STTListener:
         if self.wake_word_callback:
             self.wake_word_callback()  
 
+    # ── Partial transcription callback ────────────────────────────────────────
+
+    def _on_partial_transcription(self, text: str):
+        """Fired by the recorder thread with the current in-progress hypothesis."""
+        text = (text or "").strip()
+        if not text or text == self.partial_text:
+            return
+        self.partial_text = text
+        if self.partial_callback:
+            try:
+                self.partial_callback(text)
+            except Exception as e:
+                print(f"{GRAY}[STT] Partial callback error: {e}{RESET}")
+
     # ── Timeout timer ─────────────────────────────────────────────────────────
 
     def _reset_timeout_timer(self):
@@ -259,6 +295,7 @@ class STTListener:
                     print(f"{GRAY}[STT] ⏳ Waiting for wake word '{WAKE_WORD}'...{RESET}")
 
                 t0   = time.time()
+                self.partial_text = ""
                 try:
                     text = str(active_recorder.text() or "")  
                 except Exception:
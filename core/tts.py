@@ -1,5 +1,6 @@
 """
-TTS (Text-to-Speech) module using Piper TTS executable.
+TTS (Text-to-Speech) module using Piper TTS (a persistent in-process voice when
+the piper-tts bindings are installed, the Piper executable otherwise).
 Provides streaming sentence-based synthesis with interrupt support.
 """
 
@@ -13,6 +14,7 @@ import re
 import base64
 import zipfile
 import subprocess
+import traceback
 from pathlib import Path
 from typing import Dict, Any, Optional
 from config import OLLAMA_URL, GREEN, CYAN, YELLOW, GRAY, RESET
@@ -20,6 +22,12 @@ import requests
 import sounddevice as sd  
 from core.kokoro_tts import kokoro_tts 
 
+try:
+    # Optional: piper-tts Python bindings keep one voice loaded in-process
+    from piper import PiperVoice
+except ImportError:
+    PiperVoice = None
+
 # ANSI colors for console output
 GRAY = "\033[90m"
 CYAN = "\033[36m"
@@ -30,6 +38,31 @@ RESET = "\033[0m"
 # HTTP session for downloads
 http_session = requests.Session()
 
+# Debug flag - set to True for full tracebacks when a sentence fails to synthesize/play
+DEBUG_TTS = False
+
+# Sentences Piper may render ahead of the one currently playing
+TTS_READ_AHEAD = 2
+
+# `piper --version` result is reused across starts for the same executable build
+PIPER_PROBE_CACHE_TTL = 24 * 3600
+
+# Seconds a Piper process may take for one sentence before it is killed
+PIPER_SYNTH_TIMEOUT = 30
+
+# Resolved once: Piper is spawned per sentence and the platform never changes mid-run
+_PIPER_CREATIONFLAGS = subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+
+# Playback frame sizes (ms) while Piper streams raw PCM: start tiny so the first
+# audio goes out after ~20 ms of synthesis, then double up to a steady frame size
+_PROGRESSIVE_FRAME_MS = (20, 40, 80, 160, 200)
+
+# Consecutive in-process synthesis failures before the voice is given up on for this model
+_VOICE_MAX_FAILURES = 3
+
+# Piper's medium voices; used when the model's .onnx.json can't be read
+_DEFAULT_PIPER_SAMPLE_RATE = 22050
+
 PIPER_VOICES = {
     "Male (Northern)": {
         "model": "en_GB-northern_english_male-medium",
@@ -44,6 +77,84 @@ PIPER_VOICES = {
 }
 
 
+# Seconds the output stream stays open after the last sentence, so back-to-back
+# sentences and replies reuse the open device instead of re-running PortAudio setup
+_STREAM_IDLE_CLOSE = 3.0
+
+# Capacity of the rendered-PCM ring between synthesis and playback (~23 s at 22.05 kHz)
+_PCM_RING_BYTES = 1 << 20
+
+
+def _read_pcm_frame(pipe, view: memoryview) -> int:
+    """
+    Fill a playback frame straight from an unbuffered pipe; returns bytes read (0 at EOF).
+
+    readinto() lets the kernel copy into the frame buffer directly, instead of
+    read() copying through the pipe's own buffer and then into a new bytes object.
+    """
+    size = len(view)
+    filled = 0
+    while filled < size:
+        n = pipe.readinto(view[filled:])
+        if not n:
+            break
+        filled += n
+    return filled
+
+
+class _PcmRing:
+    """
+    Fixed-capacity single-producer/single-consumer byte ring for rendered PCM.
+
+    Piper output is read into the ring and played from views of it, so frames are
+    never allocated or copied per sentence. Each side only advances its own
+    counter; the producer waits on an Event when the ring is full.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._view = memoryview(bytearray(capacity))
+        self._written = 0   # advanced only by the producer
+        self._read = 0      # advanced only by the consumer
+        self._space = threading.Event()
+
+    @property
+    def written(self) -> int:
+        """Total bytes committed so far (monotonic)."""
+        return self._written
+
+    def _free(self) -> int:
+        return self.capacity - (self._written - self._read)
+
+    def reserve(self, size: int, cancelled) -> Optional[memoryview]:
+        """Writable view of up to size contiguous bytes; None if cancelled while full."""
+        while True:
+            pos = self._written % self.capacity
+            n = min(size, self.capacity - pos)
+            if self._free() >= n:
+                return self._view[pos:pos + n]
+            if cancelled():
+                return None
+            self._space.clear()
+            # Re-check after clearing so a release in between isn't missed
+            if self._free() < n:
+                self._space.wait(0.05)
+
+    def commit(self, n: int) -> int:
+        """Publish n bytes written into the last reserved view; returns their offset."""
+        start = self._written % self.capacity
+        self._written += n
+        return start
+
+    def frame(self, start: int, n: int) -> memoryview:
+        return self._view[start:start + n]
+
+    def release(self, n: int):
+        """Hand n played (or dropped) bytes back to the producer."""
+        self._read += n
+        self._space.set()
+
+
 class SentenceBuffer:
     """Buffers streaming text and extracts complete sentences."""
     
@@ -96,13 +207,30 @@ class PiperTTS:
         self.speech_worker = None
         self.speech_queue = queue.Queue()
         self.stop_speech = threading.Event()
-        self.interrupt_event = threading.Event()
         self.current_process = None
         self.running = False
         self._init_lock = threading.RLock()
         self.available = False
         self.worker_thread = None
+        self.playback_thread = None
+        # Synthesis and playback run on separate threads: the speech worker renders
+        # PCM into _pcm_ring up to TTS_READ_AHEAD sentences ahead of the playback
+        # worker, and _pcm_queue carries (generation, offset, length, rate) for each
+        # frame. stop() bumps _generation so stale frames are dropped.
+        self._pcm_ring = _PcmRing(_PCM_RING_BYTES)
+        self._pcm_queue = queue.Queue()
+        self._read_ahead = threading.Semaphore(TTS_READ_AHEAD + 1)
+        self._generation = 0
+        # State of the open output stream, so stop() can wake its playback worker
+        self._playback_state = None
         self.completion_callback = None
+        self._sample_rates: Dict[str, int] = {}
+        # In-process voice, loaded once per model and reused for every sentence;
+        # the executable (one process and model load per sentence) is the fallback
+        self._voice = None
+        self._voice_model: Optional[str] = None
+        self._voice_failures = 0
+        self._voice_disabled = False
         
         # Delay heavy initialization until first use to improve startup time.
         self.enabled = False
@@ -247,22 +375,20 @@ class PiperTTS:
                 try:
                     if not self.piper_exe or not Path(self.piper_exe).exists():
                         raise FileNotFoundError(f"Piper executable not found at: {self.piper_exe}")
-                    result = subprocess.run(
-                        [self.piper_exe, "--version"],
-                        capture_output=True,
-                        text=True,
-                        timeout=10,
-                        cwd=str(Path(self.piper_exe).parent)
-                    )
-                    print(f"{CYAN}[TTS] Piper version: {result.stdout.strip()}{RESET}")
+                    print(f"{CYAN}[TTS] Piper version: {self._probe_piper_version()}{RESET}")
                 except Exception as e:
                     print(f"{YELLOW}[TTS] Warning: Could not get Piper version: {e}{RESET}")
 
+                # Load the in-process voice now rather than on the first sentence
+                self._load_voice()
+
                 # Start the worker thread
                 if not self.running:
                     self.running = True
                     self.worker_thread = threading.Thread(target=self._speech_worker, daemon=True)
                     self.worker_thread.start()
+                    self.playback_thread = threading.Thread(target=self._playback_worker, daemon=True)
+                    self.playback_thread.start()
                 self.enabled = True
                 self.available = True
 
@@ -271,84 +397,355 @@ class PiperTTS:
 
             except Exception as e:
                 print(f"{YELLOW}[TTS] Failed to initialize: {e}{RESET}")
-                import traceback
                 traceback.print_exc()
                 return False
     
+    def _probe_piper_version(self) -> str:
+        """
+        Run `piper --version`, reusing the last result for the same executable.
+
+        The probe spawns a process on every start; its result only changes when
+        the executable does, so it is cached in the Piper folder keyed by the
+        executable's path, size and mtime, and re-run at most once a day.
+        """
+        exe = Path(self.piper_exe)
+        stat = exe.stat()
+        key = {"exe": str(exe), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        cache_path = self.piper_dir / ".version_cache.json"
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if (all(cached.get(k) == v for k, v in key.items())
+                    and time.time() - cached.get("checked_at", 0) < PIPER_PROBE_CACHE_TTL):
+                return cached["version"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+        result = subprocess.run(
+            [str(exe), "--version"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+            cwd=str(exe.parent),
+            creationflags=_PIPER_CREATIONFLAGS
+        )
+        version = result.stdout.strip()
+        if result.returncode == 0:
+            try:
+                with open(cache_path, "w", encoding="utf-8") as f:
+                    json.dump({**key, "version": version, "checked_at": time.time()}, f)
+            except OSError:
+                pass
+        return version
+
     def _speech_worker(self):
-        """Background thread that plays queued sentences."""
+        """Background thread that synthesizes queued sentences ahead of playback."""
         while self.running:
+            # Sleeps until work arrives; shutdown() wakes it with the None sentinel
+            text = self.speech_queue.get()
+            if text is None:
+                self._pcm_queue.put(None)
+                break
+
+            # Blocks while TTS_READ_AHEAD sentences are already rendered but unplayed
+            self._read_ahead.acquire()
+            generation = self._generation
             try:
-                if self.interrupt_event.is_set():
-                    self.interrupt_event.clear()
-                
-                text = self.speech_queue.get(timeout=0.5)
-                if text is None:
+                self._synthesize_text(text, generation)
+            finally:
+                # End-of-sentence marker: playback releases the slot and marks the task done
+                self._pcm_queue.put((generation, None, 0, 0))
+
+    def _finish_sentence(self):
+        """Free a read-ahead slot and mark the sentence's queue task done."""
+        self._read_ahead.release()
+        self.speech_queue.task_done()
+
+    def _playback_worker(self):
+        """
+        Background thread that keeps one PortAudio callback stream open while speech flows.
+
+        The stream's callback pulls frames from _pcm_queue itself, so no Python
+        thread wakes per block of audio; this thread only hears about finished
+        sentences. The stream is reused across sentences and replies, and is
+        closed after _STREAM_IDLE_CLOSE seconds of silence or on a voice switch.
+        """
+        pending = None
+        while True:
+            item = pending if pending is not None else self._pcm_queue.get()
+            pending = None
+            if item is None:
+                break
+            generation, start, length, samplerate = item
+            if start is None:
+                # Empty sentence
+                self._finish_sentence()
+                continue
+            if generation != self._generation:
+                self._pcm_ring.release(length)
+                continue
+
+            state = {
+                "frame": self._pcm_ring.frame(start, length), "start": start, "offset": 0,
+                "generation": generation, "samplerate": samplerate,
+                "last_audio": time.monotonic(), "closing": False,
+                "pending": None, "shutdown": False,
+                # True per end-of-sentence marker played, False when the callback stops itself
+                "events": queue.SimpleQueue(),
+            }
+            try:
+                stream = sd.RawOutputStream(
+                    samplerate=samplerate, channels=1, dtype='int16',
+                    callback=lambda outdata, frames, time_info, status: self._fill_output(state, outdata)
+                )
+                stream.start()
+            except Exception as e:
+                print(f"{YELLOW}[TTS Error]: {e}{RESET}")
+                if DEBUG_TTS:
+                    traceback.print_exc()
+                self._pcm_ring.release(length)
+                continue
+
+            self._playback_state = state
+            interrupted = False
+            while True:
+                try:
+                    event = state["events"].get(timeout=_STREAM_IDLE_CLOSE)
+                    if event:
+                        # Let the sentence tail leave the device before reporting it done
+                        time.sleep(stream.latency)
+                        self._finish_sentence()
+                        continue
+                    # None: woken by stop(); False: the callback stopped the stream
+                    interrupted = event is None
                     break
-                
-                if self.interrupt_event.is_set():
-                    self.speech_queue.task_done()
-                    continue
+                except queue.Empty:
+                    idle = time.monotonic() - state["last_audio"]
+                    if state["frame"] is None and idle >= _STREAM_IDLE_CLOSE:
+                        break
 
-                self._speak_text(text)
-                self.speech_queue.task_done()
+            self._playback_state = None
+            state["closing"] = True
+            try:
+                if interrupted:
+                    # Discard audio already handed to the device instead of letting it drain
+                    stream.abort()
+                else:
+                    stream.stop()
+            finally:
+                stream.close()
+            while not state["events"].empty():
+                if state["events"].get():
+                    self._finish_sentence()
+            frame = state["frame"]
+            if frame is not None:
+                # A frame pulled just as the stream went idle: replay its unplayed part
+                offset = state["offset"]
+                self._pcm_ring.release(offset)
+                pending = (state["generation"], state["start"] + offset, len(frame) - offset, state["samplerate"])
+            elif state["shutdown"]:
+                break
+            else:
+                pending = state["pending"]
+
+    def _fill_output(self, state, outdata):
+        """PortAudio callback body: copy live frames into outdata, padding gaps with silence."""
+        need, pos = len(outdata), 0
+        try:
+            while pos < need:
+                frame = state["frame"]
+                if frame is not None and state["generation"] != self._generation:
+                    # Interrupted mid-frame: drop the rest of it
+                    self._pcm_ring.release(len(frame))
+                    state["frame"] = frame = None
+                if frame is None and not self._next_output_frame(state):
+                    break   # synthesis is behind or idle: pad this block with silence
+                frame, offset = state["frame"], state["offset"]
+                n = min(need - pos, len(frame) - offset)
+                outdata[pos:pos + n] = frame[offset:offset + n]
+                pos += n
+                if offset + n == len(frame):
+                    self._pcm_ring.release(len(frame))
+                    state["frame"] = None
+                else:
+                    state["offset"] = offset + n
+            if pos:
+                state["last_audio"] = time.monotonic()
+        finally:
+            if pos < need:
+                outdata[pos:need] = bytes(need - pos)
+
+    def _next_output_frame(self, state) -> bool:
+        """Load the next live frame into state; False if none is ready yet."""
+        while not state["closing"]:
+            try:
+                item = self._pcm_queue.get_nowait()
             except queue.Empty:
+                return False
+            if item is None:
+                state["shutdown"] = True
+                state["events"].put(False)
+                raise sd.CallbackStop
+            generation, start, length, samplerate = item
+            if start is None:
+                state["events"].put(True)
                 continue
+            if generation != self._generation:
+                self._pcm_ring.release(length)
+                continue
+            if samplerate != state["samplerate"]:
+                # Voice switched: the worker reopens the stream at the new rate
+                state["pending"] = item
+                state["events"].put(False)
+                raise sd.CallbackStop
+            state["frame"], state["start"], state["offset"] = self._pcm_ring.frame(start, length), start, 0
+            state["generation"] = generation
+            return True
+        return False
     
-    def _speak_text(self, text):
-        """Synthesize text to WAV file then play. Avoids audio device conflicts with STT."""
+    def _model_sample_rate(self) -> int:
+        """Output sample rate of the current voice, read once from its .onnx.json."""
+        model_path = str(self.model_path)
+        rate = self._sample_rates.get(model_path)
+        if rate is None:
+            try:
+                with open(model_path + ".json", "r", encoding="utf-8") as f:
+                    rate = int(json.load(f)["audio"]["sample_rate"])
+            except Exception:
+                rate = _DEFAULT_PIPER_SAMPLE_RATE
+            self._sample_rates[model_path] = rate
+        return rate
+
+    def _load_voice(self):
+        """Return the in-process Piper voice for the current model, loading it once."""
+        if PiperVoice is None or not self.model_path:
+            return None
+        model_path = str(self.model_path)
+        if self._voice_model != model_path:
+            # Recorded even on failure so a broken install isn't retried every sentence
+            self._voice, self._voice_model, self._voice_failures = None, model_path, 0
+            self._voice_disabled = False
+            try:
+                self._voice = PiperVoice.load(model_path)
+                print(f"{GREEN}[TTS] ✓ Piper voice loaded in-process{RESET}")
+            except Exception as e:
+                print(f"{YELLOW}[TTS] In-process Piper unavailable, using executable: {e}{RESET}")
+        return None if self._voice_disabled else self._voice
+
+    def _synthesize_text(self, text, generation):
+        """Synthesize one sentence, preferring the persistent in-process voice."""
         if not self.piper_exe or not self.model_path or not text.strip():
             return
-        
-        import tempfile
-        import soundfile as sf
-        
-        tmp_wav = None
+        if generation != self._generation:
+            return
+
+        voice = self._load_voice()
+        if voice is None:
+            self._synthesize_with_executable(text, generation)
+            return
+        written = self._pcm_ring.written
         try:
-            # Write output to a temp WAV file — Piper never touches the audio device this way,
-            # preventing the 0xC0000409 crash caused by audio driver conflicts with open STT streams.
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                tmp_wav = f.name
-            
+            self._synthesize_in_process(voice, text.strip(), generation)
+            self._voice_failures = 0
+        except Exception as e:
+            print(f"{YELLOW}[TTS Error]: {e}{RESET}")
+            if DEBUG_TTS:
+                traceback.print_exc()
+            # Keep the loaded voice through a one-off failure; stop preferring it if they repeat
+            self._voice_failures += 1
+            if self._voice_failures >= _VOICE_MAX_FAILURES:
+                self._voice_disabled = True
+                print(f"{YELLOW}[TTS] In-process Piper keeps failing, using executable{RESET}")
+            if self._pcm_ring.written == written:
+                # Nothing of this sentence reached playback yet, so it can still be spoken whole
+                self._synthesize_with_executable(text, generation)
+
+    def _synthesize_in_process(self, voice, text, generation):
+        """
+        Synthesize with the loaded PiperVoice and hand its PCM to playback.
+
+        Each chunk the voice yields is sliced into the same progressive frames as
+        the executable path (20 ms doubling to 200 ms) and copied into the ring.
+        """
+        is_stale = lambda: generation != self._generation
+        step = 0
+        for chunk in voice.synthesize(text):
+            if is_stale():
+                return
+            samplerate = chunk.sample_rate
+            data = memoryview(chunk.audio_int16_bytes)
+            # 16-bit mono: 2 bytes per sample
+            frame_sizes = [samplerate * ms // 1000 * 2 for ms in _PROGRESSIVE_FRAME_MS]
+            offset = 0
+            while offset < len(data):
+                size = min(frame_sizes[min(step, len(frame_sizes) - 1)], len(data) - offset)
+                view = self._pcm_ring.reserve(size, is_stale)
+                if view is None:
+                    return
+                n = len(view)
+                view[:] = data[offset:offset + n]
+                offset += n
+                step += 1
+                self._pcm_queue.put((generation, self._pcm_ring.commit(n), n, samplerate))
+
+    def _synthesize_with_executable(self, text, generation):
+        """
+        Synthesize text with the Piper executable and hand its PCM to playback as it streams.
+
+        Piper writes raw 16-bit mono PCM to stdout (it never touches the audio
+        device, avoiding the 0xC0000409 crash from driver conflicts with open STT
+        streams). Frames start at 20 ms and double towards 200 ms, so the first
+        audio plays after a few ms of synthesis instead of a whole sentence.
+        """
+        try:
+            samplerate = self._model_sample_rate()
             cmd = [
                 str(self.piper_exe),
                 "--model", str(self.model_path),
-                "--output_file", tmp_wav,
+                "--output_raw",
                 "--quiet"
             ]
             
             self.current_process = subprocess.Popen(
                 cmd,
                 stdin=subprocess.PIPE,
-                stdout=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
+                bufsize=0,
                 cwd=str(Path(self.piper_exe).parent),
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-            )
-            
-            _, stderr = self.current_process.communicate(
-                input=(text.strip() + "\n").encode('utf-8'),
-                timeout=30
+                creationflags=_PIPER_CREATIONFLAGS
             )
+            process = self.current_process
+            # The reads below block on the pipe; killing a hung Piper makes them return EOF
+            timed_out = threading.Event()
+            def _kill_hung():
+                timed_out.set()
+                process.kill()
+            watchdog = threading.Timer(PIPER_SYNTH_TIMEOUT, _kill_hung)
+            watchdog.daemon = True
+            watchdog.start()
+            try:
+                process.stdin.write((text.strip() + "\n").encode('utf-8'))
+                process.stdin.close()
+                self._stream_piper_output(process, samplerate, generation)
+                stale = generation != self._generation
+                if stale:
+                    process.kill()
+                stderr = process.stderr.read()
+            finally:
+                watchdog.cancel()
             
-            if self.interrupt_event.is_set():
-                if self.current_process: self.current_process.kill()
+            if timed_out.is_set():
+                print(f"{YELLOW}[TTS] Synthesis timeout{RESET}")
+            if stale or timed_out.is_set():
+                process.wait()
                 self.current_process = None
                 return
             
-            if self.current_process.returncode != 0:
+            if process.wait(timeout=PIPER_SYNTH_TIMEOUT) != 0:
                 err_msg = stderr.decode('utf-8', errors='ignore').strip()
-                print(f"{YELLOW}[TTS] Piper error (code {self.current_process.returncode}): {err_msg}{RESET}")
-                self.current_process = None
-                return
-            
+                print(f"{YELLOW}[TTS] Piper error (code {process.returncode}): {err_msg}{RESET}")
             self.current_process = None
-            
-            # Play the WAV file
-            if tmp_wav and os.path.exists(tmp_wav) and not self.interrupt_event.is_set():
-                data, samplerate = sf.read(tmp_wav, dtype='int16')
-                if len(data) > 0:
-                    sd.play(data, samplerate=samplerate, blocking=True)
                 
         except subprocess.TimeoutExpired:
             print(f"{YELLOW}[TTS] Synthesis timeout{RESET}")
@@ -356,16 +753,30 @@ class PiperTTS:
                 self.current_process.kill()
                 self.current_process = None
         except Exception as e:
+            # Runs once per failed sentence, so a broken voice shouldn't dump a stack for each one
             print(f"{YELLOW}[TTS Error]: {e}{RESET}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            # Clean up temp file
-            if tmp_wav and os.path.exists(tmp_wav):
-                try:
-                    os.remove(tmp_wav)
-                except:
-                    pass
+            if DEBUG_TTS:
+                traceback.print_exc()
+            if self.current_process:
+                self.current_process.kill()
+                self.current_process = None
+    
+    def _stream_piper_output(self, process, samplerate, generation):
+        """Read Piper's raw PCM into the ring frame by frame until EOF or interrupt."""
+        # 16-bit mono: 2 bytes per sample
+        frame_sizes = [samplerate * ms // 1000 * 2 for ms in _PROGRESSIVE_FRAME_MS]
+        is_stale = lambda: generation != self._generation
+        step = 0
+        while not is_stale():
+            view = self._pcm_ring.reserve(frame_sizes[min(step, len(frame_sizes) - 1)], is_stale)
+            if view is None:
+                break
+            filled = _read_pcm_frame(process.stdout, view)
+            if not filled:
+                break
+            step += 1
+            # The short tail at end of sentence is queued as-is rather than padded
+            self._pcm_queue.put((generation, self._pcm_ring.commit(filled), filled, samplerate))
     
     def queue_sentence(self, sentence):
         """Add a sentence to the speech queue."""
@@ -387,15 +798,20 @@ class PiperTTS:
     
     def stop(self):
         """Interrupt current speech and clear queue."""
-        self.interrupt_event.set()
-        with self.speech_queue.mutex:
-            self.speech_queue.queue.clear()
+        # Frames already rendered for the old generation are dropped by playback
+        self._generation += 1
+        while True:
+            try:
+                self.speech_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.speech_queue.task_done()
         
-        # Stop current playback
-        try:
-            sd.stop()
-        except:
-            pass
+        # The bumped generation already makes the next callback output silence; waking the
+        # playback worker also aborts the open stream so buffered audio stops at once
+        state = self._playback_state
+        if state is not None:
+            state["events"].put(None)
         
         # Kill current piper process if running
         if self.current_process:
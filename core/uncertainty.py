@@ -30,11 +30,11 @@ class UncertaintyAnalyzer:
         Analyze response and quantify uncertainty level.
         Returns: confidence_score (0-100), confidence_level (low/medium/high)
         """
-        # Count confidence markers
+        # Count confidence markers (keywords are already lowercase; lower the response once)
+        response_lower = response.lower()
         confidence_scores = {
-            "high": len([w for w in self.CONFIDENCE_KEYWORDS["high"] if w.lower() in response.lower()]),
-            "medium": len([w for w in self.CONFIDENCE_KEYWORDS["medium"] if w.lower() in response.lower()]),
-            "low": len([w for w in self.CONFIDENCE_KEYWORDS["low"] if w.lower() in response.lower()])
+            level: sum(1 for w in keywords if w in response_lower)
+            for level, keywords in self.CONFIDENCE_KEYWORDS.items()
         }
         
         # Calculate confidence score
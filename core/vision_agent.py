@@ -2,6 +2,7 @@ import base64
 import json
 import io
 import time
+import threading
 import requests 
 from typing import Dict, Any, List, Optional
 from pathlib import Path
@@ -24,6 +25,12 @@ except ImportError:
     pyautogui = None
     Image = None
 
+try:
+    # Reads the framebuffer directly instead of going through pyscreeze/PIL.ImageGrab
+    import mss 
+except ImportError:
+    mss = None
+
 from core.omni_parser_client import omni_parser 
 
 class VisionAgent:
@@ -37,15 +44,29 @@ class VisionAgent:
         # Use simpler model for description tasks to avoid parsing issues
         self.description_model = "llama3.2:3b"  # More reliable for descriptions
         
+        # mss handles are per thread (the GDI/X11 handles they wrap are thread-bound)
+        self._sct_local = threading.local()
+        
+    def _grab_screen(self):
+        """Screenshot the primary display as a PIL RGB image."""
+        if not mss:
+            return pyautogui.screenshot()
+        sct = getattr(self._sct_local, "sct", None)
+        if sct is None:
+            sct = self._sct_local.sct = mss.mss()
+        raw = sct.grab(sct.monitors[1])  # Primary display, matching pyautogui.screenshot()
+        # Decode the native BGRA buffer in C, without the intermediate copies ScreenShot.rgb makes
+        return Image.frombuffer("RGB", raw.size, raw.raw, "raw", "BGRX", 0, 1)
+        
     def _capture_screen_base64(self) -> str:
         """Capture current screen and convert to a base64 string."""
         if not pyautogui or not Image:
             raise ImportError("PyAutoGUI or Pillow is missing.")
             
         try:
-            screenshot = pyautogui.screenshot() 
+            screenshot = self._grab_screen()
             buffered = io.BytesIO()
-            screenshot.save(buffered, format="PNG") 
+            screenshot.save(buffered, format="PNG", compress_level=1)  # Transient payload, encode fast
             return base64.b64encode(buffered.getvalue()).decode("utf-8")
         except Exception as e:
             print(f"[VisionAgent] Capture error: {e}")
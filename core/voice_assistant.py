@@ -5,7 +5,7 @@ Manages: STT → Function Gemma → Qwen → TTS pipeline.
 
 from typing import Optional, cast, Any
 from PySide6.QtCore import QObject, Signal
-from core.llm import route_query, should_bypass_router, http_session  
+from core.llm import route_query, should_bypass_router, http_session, json_loads  
 from core.pc_control import pc_controller  
 from core.vision_agent import vision_agent  
 from core.dev_agent import dev_agent  
@@ -26,6 +26,7 @@ import threading
 import time
 import os
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 import psutil  
 from datetime import datetime
 from typing import Dict, Any, List, Optional, cast
@@ -44,12 +45,21 @@ ACTION_FUNCTIONS = {
 }
 
 
+# Heuristic tables for request classification, built once at import
+_CAPABILITY_ASK_RE = re.compile(r"\b(can you|do you|are you able to|do u)\b")
+_MENTIONS_PC_RE = re.compile(r"\b(pc|computer|desktop|laptop|system)\b")
+_MENTIONS_CONTROL_RE = re.compile(r"\b(control|open|close|volume|shutdown|restart|lock|launch|manage)\b")
+_COMPLEX_CONNECTORS = (" and then ", " then ", " after that ", " step ", "first", "second", "multi", "complex")
+_COMPLEX_KEYWORDS = ("analyze", "explain in detail", "architecture", "design", "build", "scaffold", "reason")
+
+
 class VoiceAssistant(QObject):
     """Main voice assistant orchestrator."""
     
     # Signals for UI updates (optional)
     wake_word_detected = Signal()
     speech_recognized = Signal(str)
+    partial_speech = Signal(str)  # in-progress hypothesis while the user speaks
     processing_started = Signal()
     processing_finished = Signal()
     error_occurred = Signal(str)
@@ -75,6 +85,8 @@ class VoiceAssistant(QObject):
         self.current_stream = ""
         self._request_lock = threading.Lock()
         self._active_request_id = 0
+        # Single worker so the local router model only ever runs one query at a time
+        self._router_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="voice-router")
         
     def initialize(self) -> bool:
         """Initialize voice assistant components."""
@@ -85,23 +97,31 @@ class VoiceAssistant(QObject):
             self.stt_listener = STTListener(
                 wake_word_callback=self._on_wake_word,
                 speech_callback=self._on_speech,
-                stop_callback=self._on_stop
+                stop_callback=self._on_stop,
+                partial_callback=self._on_partial_speech
             )
             print(f"{CYAN}[VoiceAssistant] ✓ STT listener created{RESET}")
             
+            # Ensure TTS is initialized. It shares nothing with STT, so load it on a
+            # separate thread while the Whisper models load; startup then takes the
+            # slower of the two instead of their sum.
+            tts_thread = None
+            if not tts.piper_exe:
+                print(f"{CYAN}[VoiceAssistant] Initializing TTS...{RESET}")
+                tts_thread = threading.Thread(target=tts.initialize, daemon=True)
+                tts_thread.start()
+            
             print(f"{CYAN}[VoiceAssistant] Initializing STT models...{RESET}")
             stt = cast(Any, self.stt_listener)
-            if not stt.initialize():
+            stt_ok = stt.initialize()
+            if tts_thread:
+                tts_thread.join()
+                print(f"{CYAN}[VoiceAssistant] ✓ TTS initialized{RESET}")
+            if not stt_ok:
                 print(f"{GRAY}[VoiceAssistant] ✗ Failed to initialize STT.{RESET}")
                 return False
             print(f"{CYAN}[VoiceAssistant] ✓ STT initialized{RESET}")
             
-            # Ensure TTS is initialized
-            if not tts.piper_exe:
-                print(f"{CYAN}[VoiceAssistant] Initializing TTS...{RESET}")
-                tts.initialize()
-                print(f"{CYAN}[VoiceAssistant] ✓ TTS initialized{RESET}")
-            
             print(f"{CYAN}[VoiceAssistant] ✓ Voice assistant initialized successfully{RESET}")
             return True
         except Exception as e:
@@ -163,6 +183,10 @@ class VoiceAssistant(QObject):
         self.wake_word_detected.emit()
         print(f"{GREEN}[VoiceAssistant] ✓ Signal emitted. Listening for speech...{RESET}")
 
+    def _on_partial_speech(self, text: str):
+        """Relay partial STT hypotheses so the UI can show them live."""
+        self.partial_speech.emit(text)
+
     def _next_request_id(self) -> int:
         with self._request_lock:
             self._active_request_id += 1
@@ -216,18 +240,16 @@ class VoiceAssistant(QObject):
     def _is_pc_capability_query(self, user_text: str) -> bool:
         """Detect capability checks that should get deterministic assistant grounding."""
         txt = user_text.lower().strip()
-        asks_capability = bool(re.search(r"\b(can you|do you|are you able to|do u)\b", txt))
-        mentions_pc = bool(re.search(r"\b(pc|computer|desktop|laptop|system)\b", txt))
-        mentions_control = bool(re.search(r"\b(control|open|close|volume|shutdown|restart|lock|launch|manage)\b", txt))
+        asks_capability = bool(_CAPABILITY_ASK_RE.search(txt))
+        mentions_pc = bool(_MENTIONS_PC_RE.search(txt))
+        mentions_control = bool(_MENTIONS_CONTROL_RE.search(txt))
         return asks_capability and (mentions_pc or mentions_control)
 
     def _is_complex_request(self, user_text: str) -> bool:
         """Heuristic complexity check used for fatigue gating."""
         txt = (user_text or "").lower()
-        connectors = [" and then ", " then ", " after that ", " step ", "first", "second", "multi", "complex"]
-        complex_keywords = ["analyze", "explain in detail", "architecture", "design", "build", "scaffold", "reason"]
-        has_connectors = any(c in txt for c in connectors)
-        has_complex_kw = any(k in txt for k in complex_keywords)
+        has_connectors = any(c in txt for c in _COMPLEX_CONNECTORS)
+        has_complex_kw = any(k in txt for k in _COMPLEX_KEYWORDS)
         return has_connectors or has_complex_kw or len(txt.split()) > 14
     
     def _execute_advanced_task(self, user_text: str, stop_event: threading.Event, request_id: int):
@@ -370,6 +392,13 @@ class VoiceAssistant(QObject):
                 self.processing_finished.emit()
                 return
             
+            # Routing only needs the raw text, so start it now and let the local
+            # router run while the reasoning and curiosity LLM calls are in flight.
+            if should_bypass_router(user_text):
+                routing = None
+            else:
+                routing = self._router_pool.submit(route_query, user_text)
+
             # Step 0f: Chain-of-Thought Reasoning - Think before routing
             print(f"{CYAN}[VoiceAssistant] Engaging chain-of-thought reasoning...{RESET}")
             reasoning_result = reasoning_engine.think_step_by_step(user_text)
@@ -387,11 +416,11 @@ class VoiceAssistant(QObject):
                 if clarifying_questions:
                     print(f"{CYAN}[CuriosityEngine] Generated clarifying questions: {clarifying_questions[:2]}{RESET}")
             
-            # Step 2: Route through Function Gemma (with reasoning context)
-            if should_bypass_router(user_text):
+            # Step 2: Route through Function Gemma (started alongside reasoning above)
+            if routing is None:
                 calls = [("nonthinking", {"prompt": user_text})]
             else:
-                calls = route_query(user_text)
+                calls = routing.result()
 
             if self._is_stale_request(request_id, stop_event):
                 return
@@ -646,7 +675,7 @@ class VoiceAssistant(QObject):
 
                         if line:
                             try:
-                                chunk = json.loads(line.decode('utf-8'))
+                                chunk = json_loads(line)
                                 msg = chunk.get('message', {})
 
                                 if 'content' in msg and msg['content']:
@@ -878,7 +907,7 @@ class VoiceAssistant(QObject):
                         
                         if line:
                             try:
-                                chunk = json.loads(line.decode('utf-8'))
+                                chunk = json_loads(line)
                                 msg = chunk.get('message', {})
                                 
                                 if 'content' in msg and msg['content']:
@@ -0,0 +1,105 @@
+import unittest
+import os
+import sys
+from unittest.mock import patch, MagicMock
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.bug_watcher import BugWatcher
+
+
+class TestBandOCR(unittest.TestCase):
+    def setUp(self):
+        self.watcher = BugWatcher()
+        self.watcher.ocr_band_height = 4
+        self.watcher.ocr_band_overlap = 2
+        # Stubbed OCR: each band reports the row it starts on (every row is filled with its index)
+        self.ocr_calls = []
+
+        def fake_ocr(band, config):
+            self.ocr_calls.append(int(band[0, 0]))
+            return f"band{int(band[0, 0])}"
+
+        self.watcher._image_to_text = fake_ocr
+
+    def tearDown(self):
+        self.watcher._release_ocr()
+
+    def _frame(self, rows=12, cols=8):
+        return np.repeat(np.arange(rows, dtype=np.uint8)[:, None], cols, axis=1)
+
+    def test_first_frame_ocrs_every_band_in_order(self):
+        """Every band of a new frame is OCR'd and the text is merged top to bottom."""
+        text = self.watcher._ocr_frame(self._frame(), "cfg")
+
+        self.assertEqual(sorted(self.ocr_calls), [0, 4, 8])
+        self.assertEqual(text, "band0\nband4\nband8")
+
+    def test_only_changed_bands_are_ocrd_again(self):
+        """A change confined to one band sends only that band back through OCR."""
+        frame = self._frame()
+        self.watcher._ocr_frame(frame, "cfg")
+        self.ocr_calls.clear()
+
+        # Row 11 lies in the last band only (band 4 spans rows 4-9 with its overlap)
+        changed = frame.copy()
+        changed[11, :] = 200
+        text = self.watcher._ocr_frame(changed, "cfg")
+
+        self.assertEqual(self.ocr_calls, [8])
+        self.assertEqual(text, "band0\nband4\nband8")
+
+    def test_overlap_change_ocrs_both_bands_again(self):
+        """A row inside the overlap belongs to both neighbouring bands."""
+        frame = self._frame()
+        self.watcher._ocr_frame(frame, "cfg")
+        self.ocr_calls.clear()
+
+        changed = frame.copy()
+        changed[9, :] = 200
+        self.watcher._ocr_frame(changed, "cfg")
+
+        self.assertEqual(sorted(self.ocr_calls), [4, 8])
+
+    def test_new_frame_shape_drops_band_cache(self):
+        """A different window size invalidates every cached band."""
+        self.watcher._ocr_frame(self._frame(), "cfg")
+        self.ocr_calls.clear()
+
+        self.watcher._ocr_frame(self._frame(cols=16), "cfg")
+
+        self.assertEqual(sorted(self.ocr_calls), [0, 4, 8])
+
+
+class TestFrameDigestSkip(unittest.TestCase):
+    def test_unchanged_frame_skips_ocr(self):
+        """A frame whose digest matches the last OCR'd one is not OCR'd again."""
+        watcher = BugWatcher()
+        digests = iter([b"a", b"a", b"b"])
+        ticks = []
+
+        def next_tick(deadline):
+            ticks.append(deadline)
+            if len(ticks) == 3:
+                watcher.running = False
+            return deadline
+
+        watcher.running = True
+        with patch("core.bug_watcher.pyautogui", MagicMock()), \
+                patch("core.bug_watcher.pytesseract", MagicMock()), \
+                patch.object(watcher, "_capture", return_value=(MagicMock(), "cfg")), \
+                patch.object(watcher, "_frame_digest", side_effect=lambda shot: next(digests)), \
+                patch.object(watcher, "_prepare_for_ocr", side_effect=lambda shot: shot), \
+                patch.object(watcher, "_ocr_frame", return_value="all quiet") as ocr, \
+                patch.object(watcher, "_wait_for_next_tick", side_effect=next_tick):
+            watcher._scan_until_stopped()
+
+        self.assertEqual(ocr.call_count, 2)
+        self.assertEqual(watcher._last_frame_digest, b"b")
+
+
+if __name__ == '__main__':
+    unittest.main()
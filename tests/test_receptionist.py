@@ -34,6 +34,23 @@ class TestReceptionist(unittest.TestCase):
         self.assertEqual(len(logs), 1)
         self.assertEqual(logs[0]["transcript"], call_data["transcript"])
 
+    @patch('core.receptionist.tts')
+    @patch('core.receptionist.requests.post')
+    def test_stream_failure_returns_spoken_text(self, mock_post, mock_tts):
+        """A stream that breaks mid-reply reports what was voiced, not the fallback."""
+        def lines():
+            yield b'{"response": "Thanks for calling. ", "done": false}'
+            raise ConnectionError("stream dropped")
+
+        response = MagicMock(status_code=200)
+        response.iter_lines.side_effect = lines
+        mock_post.return_value.__enter__.return_value = response
+
+        reply = self.receptionist._generate_response("Greet the caller.", speak=True)
+
+        self.assertEqual(reply, "Thanks for calling.")
+        mock_tts.queue_sentence.assert_called_once_with("Thanks for calling.")
+
     def test_sentiment_analysis_mock(self):
         """Test client mood categorization (Mocked AI Analysis)."""
         # Mocking the internal productivity suite analysis
@@ -0,0 +1,116 @@
+import unittest
+import os
+import sys
+import queue
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.tts import PiperTTS, _PcmRing
+
+RATE = 22050
+
+
+class TestPcmRing(unittest.TestCase):
+    def test_reserve_commit_release_across_wrap(self):
+        """Views stay contiguous: a reservation at the end is cut short, the next one wraps to 0."""
+        ring = _PcmRing(8)
+        never = lambda: False
+
+        view = ring.reserve(6, never)
+        view[:] = b"abcdef"
+        self.assertEqual(ring.commit(6), 0)
+        ring.release(6)
+
+        # Only two bytes left before the end of the buffer
+        view = ring.reserve(6, never)
+        self.assertEqual(len(view), 2)
+        view[:] = b"gh"
+        self.assertEqual(ring.commit(2), 6)
+
+        view = ring.reserve(4, never)
+        self.assertEqual(len(view), 4)
+        view[:] = b"ijkl"
+        self.assertEqual(ring.commit(4), 0)
+
+        self.assertEqual(bytes(ring.frame(6, 2)), b"gh")
+        self.assertEqual(bytes(ring.frame(0, 4)), b"ijkl")
+        ring.release(6)
+        self.assertEqual(ring.written, 12)
+
+    def test_reserve_returns_none_once_stale(self):
+        """A producer waiting on a full ring gives up when its sentence goes stale."""
+        ring = _PcmRing(4)
+        ring.reserve(4, lambda: False)
+        ring.commit(4)
+
+        self.assertIsNone(ring.reserve(4, lambda: True))
+
+
+class TestPiperPlayback(unittest.TestCase):
+    def setUp(self):
+        self.tts = PiperTTS()
+
+    def _queue_frame(self, data: bytes, generation: int):
+        """Write data into the ring and queue it for playback like the synthesis path does."""
+        view = self.tts._pcm_ring.reserve(len(data), lambda: False)
+        view[:] = data
+        start = self.tts._pcm_ring.commit(len(data))
+        self.tts._pcm_queue.put((generation, start, len(data), RATE))
+
+    def _state(self):
+        return {
+            "frame": None, "start": 0, "offset": 0,
+            "generation": self.tts._generation, "samplerate": RATE,
+            "last_audio": time.monotonic(), "closing": False,
+            "pending": None, "shutdown": False,
+            "events": queue.SimpleQueue(),
+        }
+
+    def test_next_output_frame_skips_older_generation(self):
+        """Frames rendered before an interrupt are released, not played."""
+        self._queue_frame(b"old!", generation=0)
+        self.tts._generation = 1
+        self._queue_frame(b"new!", generation=1)
+        state = self._state()
+
+        self.assertTrue(self.tts._next_output_frame(state))
+        self.assertEqual(bytes(state["frame"]), b"new!")
+        self.assertEqual(state["generation"], 1)
+        # The stale frame's bytes went back to the producer
+        self.assertEqual(self.tts._pcm_ring._read, 4)
+
+    def test_partial_frame_carried_across_callbacks(self):
+        """A frame longer than one output block continues in the next block, then pads with silence."""
+        self._queue_frame(b"abcdef", generation=0)
+        state = self._state()
+
+        first = bytearray(4)
+        self.tts._fill_output(state, first)
+        self.assertEqual(bytes(first), b"abcd")
+        self.assertEqual(state["offset"], 4)
+
+        second = bytearray(4)
+        self.tts._fill_output(state, second)
+        self.assertEqual(bytes(second), b"ef\x00\x00")
+        self.assertIsNone(state["frame"])
+
+    def test_stop_silences_next_callback_and_wakes_playback(self):
+        """After stop() the frame in progress is dropped and the playback worker is woken."""
+        self._queue_frame(b"abcdef", generation=0)
+        state = self._state()
+        self.tts._fill_output(state, bytearray(4))
+        self.tts._playback_state = state
+
+        self.tts.stop()
+
+        block = bytearray(4)
+        self.tts._fill_output(state, block)
+        self.assertEqual(bytes(block), bytes(4))
+        self.assertIsNone(state["frame"])
+        self.assertIsNone(state["events"].get_nowait())
+
+
+if __name__ == '__main__':
+    unittest.main()
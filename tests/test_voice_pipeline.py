@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 import os
 import sys
 
@@ -7,6 +7,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.llm import route_query
+from core.router import FunctionGemmaRouter
 
 class TestVoicePipeline(unittest.TestCase):
     
@@ -38,5 +39,41 @@ class TestVoicePipeline(unittest.TestCase):
         self.assertEqual(calls[0][0], "pc_control")
         self.assertEqual(calls[1][1]["target"], "vscode")
 
+    def test_route_batch_left_pads_and_keeps_order(self):
+        """Batched routing pads on the left and returns one result per prompt, in order."""
+        class _Inputs(dict):
+            def to(self, device):
+                return self
+
+        router = FunctionGemmaRouter.__new__(FunctionGemmaRouter)
+        router.use_ollama_fallback = False
+        router._build_prompt = lambda prompt: f"<prompt>{prompt}"
+        router._parse_function_call = lambda response, prompt: [(response, {"prompt": prompt})]
+
+        prompt_len = 4
+        router.tokenizer = MagicMock(pad_token_id=0)
+        router.tokenizer.side_effect = lambda texts, **kwargs: _Inputs(
+            input_ids=MagicMock(shape=(len(texts), prompt_len))
+        )
+        router.tokenizer.decode.side_effect = lambda tokens, **kwargs: f"call:{tokens[0]}"
+        router.model = MagicMock()
+        # Each row is the padded prompt followed by one generated token naming the prompt
+        generated = iter(["a", "b", "c"])
+        router.model.generate.side_effect = lambda **kwargs: [
+            [0] * prompt_len + [next(generated)] for _ in range(kwargs["input_ids"].shape[0])
+        ]
+
+        results = router.route_batch(["first", "second", "third"], max_batch=2)
+
+        self.assertEqual(results, [
+            [("call:a", {"prompt": "first"})],
+            [("call:b", {"prompt": "second"})],
+            [("call:c", {"prompt": "third"})],
+        ])
+        self.assertEqual(router.model.generate.call_count, 2)
+        for call in router.tokenizer.call_args_list:
+            self.assertEqual(call.kwargs["padding_side"], "left")
+        self.assertEqual(router.tokenizer.call_args_list[0].args[0], ["<prompt>first", "<prompt>second"])
+
 if __name__ == '__main__':
     unittest.main()